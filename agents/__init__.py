@@ -1,3 +1,18 @@
+from agents.profiler import profiled
+
+# Method name -> whether it returns a stream of items
+PROFILED_METHODS = {"run": False, "run_stream": True, "count_stream": False, "commit": False}
+
+
 class BaseAgent:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Instrument every agent's run() and the entry points the
+        # daily streaming chain calls instead (see agents/profiler.py)
+        for name, stream in PROFILED_METHODS.items():
+            if name in cls.__dict__:
+                setattr(cls, name, profiled(cls.__name__, cls.__dict__[name], stream=stream))
+
     def run(self, **kwargs):
         raise NotImplementedError("Each agent must implement run()")
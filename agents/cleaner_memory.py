@@ -1,6 +1,28 @@
 from agents import BaseAgent
-from typing import List, Dict
-import re
+from agents.review_hash import review_digest
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator
+
+BATCH_SIZE = 1000
+
+# Joins a batch into one string; kept by BATCH_CLEAN_TABLE
+SEPARATOR = "\x00"
+
+
+def _clean_table(keep: bytes = b"") -> bytes:
+    """
+    bytes.translate table for lower-cased, ASCII-encoded text: a-z and
+    0-9 are kept, everything else becomes a space. Whitespace turning
+    into a plain space is harmless since runs are collapsed afterwards,
+    so together with the split/join this equals
+    re.sub(r"[^a-z0-9\\s]", " ", ...) followed by re.sub(r"\\s+", " ", ...).
+    """
+    allowed = set(b"abcdefghijklmnopqrstuvwxyz0123456789" + keep)
+    return bytes(b if b in allowed else 32 for b in range(256))
+
+
+CLEAN_TABLE = _clean_table()
+BATCH_CLEAN_TABLE = _clean_table(keep=SEPARATOR.encode("ascii"))
 
 
 class CleanerMemoryAgent(BaseAgent):
@@ -14,36 +36,59 @@ class CleanerMemoryAgent(BaseAgent):
 
         Output:
             cleaned_reviews = [
-                {"text": "cleaned text", "rating": 1},
+                {"text": "cleaned text", "rating": 1, "hash": "..."},
                 ...
             ]
         """
 
-        cleaned_reviews = []
+        return self.clean_batch(reviews)
+
+    def run_stream(self, reviews: Iterable[Dict], date: str) -> Iterator[Dict]:
+        """
+        Generator form of run(): cleans BATCH_SIZE reviews at a time,
+        so this stage holds at most one batch.
+        """
+        reviews = iter(reviews)
+        while True:
+            batch = list(islice(reviews, BATCH_SIZE))
+            if not batch:
+                return
+            yield from self.clean_batch(batch)
 
-        for review in reviews:
-            text = review.get("text", "")
-            rating = review.get("rating", None)
+    def clean_batch(self, reviews: List[Dict]) -> List[Dict]:
+        """
+        Normalizes a whole page or day at once: the batch is joined
+        into one string, lower-cased, encoded and translated in single
+        C-level calls, then split back. The review hash used downstream is
+        computed in the same pass (review_digest, as hash_review does).
+        """
+        texts = [review.get("text", "") or "" for review in reviews]
+        joined = SEPARATOR.join(texts)
 
-            cleaned_text = self._clean_text(text)
+        if joined.count(SEPARATOR) == len(texts) - 1:
+            parts = _translate(joined, BATCH_CLEAN_TABLE).split(SEPARATOR)
+        else:
+            # A review contains the separator itself; clean one by one
+            parts = [_translate(text, CLEAN_TABLE) for text in texts]
+
+        cleaned_reviews = []
+        append = cleaned_reviews.append
+
+        for review, part in zip(reviews, parts):
+            cleaned_text = " ".join(part.split())
 
             if cleaned_text:
-                cleaned_reviews.append({
-                    "text": cleaned_text,
-                    "rating": rating
-                })
+                rating = review.get("rating", None)
+                append({"text": cleaned_text, "rating": rating, "hash": review_digest(cleaned_text, rating)})
 
         return cleaned_reviews
 
-    def _clean_text(self, text: str) -> str:
-        """
-        Basic normalization:
-        - lowercase
-        - remove extra spaces
-        - remove special characters
-        """
 
-        text = text.lower()
-        text = re.sub(r"[^a-z0-9\s]", " ", text)
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+# ---------- helpers ----------
+
+def _translate(text: str, table: bytes) -> str:
+    # Lower-case first: a few non-ASCII letters lower-case to ASCII
+    # (e.g. the Kelvin sign to "k"). Anything still non-ASCII is
+    # dropped to "?" here and then to a space by the table.
+    raw = text.lower().encode("ascii", "replace")
+    return raw.translate(table).decode("ascii")
@@ -0,0 +1,119 @@
+from collections import deque
+from typing import List, Dict, Optional, Sequence, Tuple
+
+
+Rule = Tuple[str, Sequence[str], Sequence[str]]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick matcher over an ordered list of topic rules.
+
+    Each rule is (topic, primary_keys, secondary_keys). A rule fires
+    when any primary key occurs in the text and, if secondary keys
+    are given, any secondary key occurs too. Keys are plain substrings,
+    the same as Python's `in`. All keys of all rules are compiled into
+    one automaton, so a text is scanned once regardless of how many
+    topics there are. When several rules fire, the earliest one wins.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = [
+            (topic, [k.lower() for k in primary], [k.lower() for k in secondary])
+            for topic, primary, secondary in rules
+        ]
+
+        self._pattern_ids: Dict[str, int] = {}
+        # pattern id -> indexes of the rules using it as a primary key
+        self._primary_rules: List[List[int]] = []
+        # rule index -> pattern ids of its secondary keys
+        self._secondary: List[frozenset] = []
+
+        for index, (_, primary, secondary) in enumerate(self.rules):
+            for key in primary:
+                pid = self._add_pattern(key)
+                if not self._primary_rules[pid] or self._primary_rules[pid][-1] != index:
+                    self._primary_rules[pid].append(index)
+            self._secondary.append(
+                frozenset(self._add_pattern(key) for key in secondary)
+            )
+
+        self._build_automaton()
+
+    def match(self, text: str) -> Optional[str]:
+        found = self.scan(text.lower())
+        if not found:
+            return None
+
+        fired = sorted({r for pid in found for r in self._primary_rules[pid]})
+        for index in fired:
+            secondary = self._secondary[index]
+            if not secondary or not secondary.isdisjoint(found):
+                return self.rules[index][0]
+
+        return None
+
+    def scan(self, text: str) -> set:
+        """
+        Returns the ids of every pattern occurring in an
+        already lower-cased text, in a single pass.
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                found.update(output[node])
+
+        return found
+
+    # ---------- helpers ----------
+
+    def _add_pattern(self, key: str) -> int:
+        pid = self._pattern_ids.get(key)
+        if pid is None:
+            pid = len(self._pattern_ids)
+            self._pattern_ids[key] = pid
+            self._primary_rules.append([])
+        return pid
+
+    def _build_automaton(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        own_output: List[List[int]] = [[]]
+
+        for key, pid in self._pattern_ids.items():
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    own_output.append([])
+                node = nxt
+            own_output[node].append(pid)
+
+        # Breadth-first: a node's fail link always points to a
+        # shallower node, whose output is already complete
+        self._output: List[tuple] = [()] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._output[child] = tuple(own_output[child])
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                link = self._fail[node]
+                while link and ch not in self._goto[link]:
+                    link = self._fail[link]
+                self._fail[child] = self._goto[link].get(ch, 0)
+                self._output[child] = tuple(own_output[child]) + self._output[self._fail[child]]
+                queue.append(child)
@@ -0,0 +1,350 @@
+import hashlib
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+SIGNATURE_HASHES = 64
+
+# Multiply-add hash functions (mod 2**32) of the signature, and the
+# multiplier that combines two word hashes into a word pair hash;
+# fixed so signatures are the same in every run
+_SALTS = np.random.default_rng(0x5EED).integers(0, 1 << 32, size=(2, SIGNATURE_HASHES), dtype=np.uint64)
+_MULTIPLIERS = _SALTS[0].astype(np.uint32) | np.uint32(1)
+_OFFSETS = _SALTS[1].astype(np.uint32)
+_PAIR_MULTIPLIER = np.uint32(0x9E3779B1)
+
+
+def char_ngrams(text: str, n: int = 3) -> Set[str]:
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(token: str) -> int:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+def minhash_batch(shingle_sets: List[Iterable[str]]) -> np.ndarray:
+    """
+    MinHash signature of every shingle set (e.g. char_ngrams of a
+    name), computed for the whole batch at once: every shingle hash
+    goes through all SIGNATURE_HASHES hash functions in one matrix,
+    and the minimum per set is taken with reduceat. Two signatures
+    agree on a position with probability equal to the Jaccard
+    similarity of the two sets.
+
+    Only the low byte of each minimum is kept: unrelated positions
+    then agree by chance 1 time in 256, and comparing signatures moves
+    a quarter of the memory.
+
+    Every set must be non-empty. Returns a (sets, SIGNATURE_HASHES)
+    uint8 array.
+    """
+    shingle_sets = [list(shingles) for shingles in shingle_sets]
+    lengths, hashes = _hash_lists(shingle_sets)
+    return _signatures(_minimums(hashes, lengths))
+
+
+def word_minhash_batch(token_lists: List[List[str]]) -> np.ndarray:
+    """
+    minhash_batch of the words and word pairs of every token list.
+    Word pair hashes are derived from neighbouring word hashes, so no
+    pair strings are built.
+    """
+    lengths, words = _hash_lists(token_lists)
+
+    # Pairs of neighbouring words, except across two lists
+    pairs = np.delete(words[:-1] * _PAIR_MULTIPLIER ^ words[1:], np.cumsum(lengths)[:-1] - 1)
+
+    return _signatures(np.minimum(_minimums(words, lengths), _minimums(pairs, lengths - 1)))
+
+
+class LSHBands:
+    """
+    Band tables over MinHash signatures: each signature is cut into
+    bands of rows positions, and two signatures sharing a whole band
+    are candidates. A pair of Jaccard similarity s shares a band with
+    probability 1 - (1 - s**rows)**bands.
+
+    Each band's table is a few sorted key arrays (runs) looked up with
+    searchsorted. Added signatures become a run of their own and runs
+    of similar size are merged, like a binary counter, so adding N
+    signatures costs O(N log N) however they are batched. Signatures
+    are numbered in the order they are added.
+    """
+
+    def __init__(self, bands: int, rows: int):
+        if not 1 <= rows <= 8 or bands < 1 or bands * rows > SIGNATURE_HASHES:
+            raise ValueError(f"rows must be 1 to 8 and bands * rows at most {SIGNATURE_HASHES}")
+
+        self.bands = bands
+        self.rows = rows
+        self._size = 0
+
+        # (keys, rows): bands x run length, each band's keys sorted
+        self._runs: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def keys(self, signatures: np.ndarray) -> np.ndarray:
+        """bands x signatures uint64 keys, a band's bytes packed together."""
+        used = signatures[:, :self.bands * self.rows].reshape(len(signatures), self.bands, self.rows)
+        shifts = np.arange(0, 8 * self.rows, 8, dtype=np.uint64)
+        return (used.astype(np.uint64) << shifts).sum(axis=2, dtype=np.uint64).T
+
+    def add(self, signatures: np.ndarray):
+        if not len(signatures):
+            return
+
+        keys = self.keys(signatures)
+        end = self._size + len(signatures)
+        run = _sorted_run(keys, _row_ids(self._size, end, keys.shape))
+        self._size = end
+
+        while self._runs and self._runs[-1][0].shape[1] <= run[0].shape[1]:
+            last_keys, last_rows = self._runs.pop()
+            run = _sorted_run(
+                np.concatenate([last_keys, run[0]], axis=1),
+                np.concatenate([last_rows, run[1]], axis=1)
+            )
+        self._runs.append(run)
+
+    def candidates(self, keys: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        (query position, row) arrays of the added signatures sharing a
+        band with each query, one pair of arrays per run and band; keys
+        come from keys(). A row is repeated for every band it shares.
+        """
+        # searchsorted is about twice as fast with sorted needles
+        order = np.argsort(keys, axis=1)
+        needles = np.take_along_axis(keys, order, axis=1)
+
+        for run_keys, run_rows in self._runs:
+            for band in range(self.bands):
+                yield _matches(run_keys[band], run_rows[band], needles[band], order[band])
+
+
+class MinHashIndex:
+    """
+    MinHash-LSH index over character n-grams of short strings, each
+    pointing to an integer id (e.g. a topic id in the registry).
+
+    query() only looks at keys that share at least one LSH band with
+    the text, then verifies them with exact Jaccard similarity, so
+    near-duplicate lookups do not scan every stored key.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        bands: int = 16,
+        rows: int = 2,
+        ngram: int = 3
+    ):
+        self.threshold = threshold
+        self.ngram = ngram
+        self._bands = LSHBands(bands, rows)
+
+        # Per added key, in LSHBands row order
+        self._keys: List[str] = []
+        self._shingles: List[Set[str]] = []
+        self._values: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, key: str, value: int):
+        """
+        Indexes key (already normalized) as pointing to the id value.
+        """
+        if key in self._values:
+            return
+
+        shingles = char_ngrams(key, self.ngram)
+        self._bands.add(minhash_batch([shingles]))
+        self._keys.append(key)
+        self._shingles.append(shingles)
+        self._values[key] = value
+
+    def query(self, key: str) -> Optional[int]:
+        """
+        Id of the most similar indexed key with Jaccard similarity of
+        at least threshold, or None.
+        """
+        shingles = char_ngrams(key, self.ngram)
+        keys = self._bands.keys(minhash_batch([shingles]))
+
+        candidates = set()
+        for _, rows in self._bands.candidates(keys):
+            candidates.update(rows.tolist())
+
+        best, best_score = None, self.threshold
+        for row in sorted(candidates, key=self._keys.__getitem__):
+            other = self._shingles[row]
+            score = len(shingles & other) / len(shingles | other)
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = row, score
+
+        return self._values[self._keys[best]] if best is not None else None
+
+
+class NearDuplicateIndex:
+    """
+    MinHash-LSH index that flags near-duplicate signatures (see
+    word_minhash_batch), filled and queried one batch at a time with
+    numpy.
+
+    Signatures sharing a band (LSHBands) are compared, and count as
+    near when they agree on at least threshold of all positions (their
+    estimated Jaccard similarity). The defaults (16 bands x 4 rows)
+    find almost every pair above 0.6 while pairs below 0.3 rarely
+    become candidates. Unlike MinHashIndex no shingles are kept to
+    verify against: a day of reviews would not fit, and the estimate
+    is close enough for texts of a dozen words or more.
+    """
+
+    def __init__(self, threshold: float = 0.6, bands: int = 16, rows: int = 4):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self._bands = LSHBands(bands, rows)
+        self._min_agreeing = int(np.ceil(threshold * SIGNATURE_HASHES - 1e-9))
+        self._signatures = np.empty((0, SIGNATURE_HASHES), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self._bands)
+
+    def insert_batch(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        Flags every signature near one already indexed or an unflagged
+        one earlier in the batch, and indexes the unflagged ones.
+        Returns the flags (bool array).
+        """
+        signatures = np.asarray(signatures, dtype=np.uint8)
+
+        # Exact copies are settled without comparing: every copy after
+        # the first is flagged, the first stands for all of them
+        _, first, inverse = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+
+        distinct = signatures[first[order]]
+        flagged = self._flag(distinct)
+        self._add(distinct[~flagged])
+
+        inverse = inverse.ravel()
+        return flagged[rank[inverse]] | (np.arange(len(signatures)) != first[inverse])
+
+    # ---------- helpers ----------
+
+    def _flag(self, signatures: np.ndarray) -> np.ndarray:
+        keys = self._bands.keys(signatures)
+
+        # Near an indexed signature
+        indexed = np.zeros(len(signatures), dtype=bool)
+        for queries, rows in self._bands.candidates(keys):
+            near = self._near(signatures[queries], self._signatures[rows])
+            indexed[queries[near]] = True
+
+        # Near an earlier signature of the batch: (later, earlier) pairs
+        batch = LSHBands(self._bands.bands, self._bands.rows)
+        batch.add(signatures)
+        later, earlier = [], []
+        for queries, rows in batch.candidates(keys):
+            pair = rows < queries
+            queries, rows = queries[pair], rows[pair]
+            near = self._near(signatures[queries], signatures[rows])
+            later.append(queries[near])
+            earlier.append(rows[near])
+        later, earlier = np.concatenate(later), np.concatenate(earlier)
+
+        # A signature only counts as a copy of one that is kept. Each
+        # pass settles one more step of "near a kept earlier one"
+        # chains; their length is bounded by the batch
+        flagged = indexed
+        while True:
+            updated = indexed.copy()
+            updated[later[~flagged[earlier]]] = True
+            if np.array_equal(updated, flagged):
+                return flagged
+            flagged = updated
+
+    def _near(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return (a == b).sum(axis=1) >= self._min_agreeing
+
+    def _add(self, signatures: np.ndarray):
+        if not len(signatures):
+            return
+
+        size = len(self._bands)
+        end = size + len(signatures)
+        if end > len(self._signatures):
+            grown = np.empty((max(end, 2 * len(self._signatures)), SIGNATURE_HASHES), dtype=np.uint8)
+            grown[:size] = self._signatures[:size]
+            self._signatures = grown
+        self._signatures[size:end] = signatures
+        self._bands.add(signatures)
+
+
+def _hash_lists(lists: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Lengths of lists and the hashes of all their items, in one array."""
+    lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+    hashes = np.fromiter(
+        map(_token_hash, chain.from_iterable(lists)),
+        dtype=np.uint32,
+        count=int(lengths.sum())
+    )
+    return lengths, hashes
+
+
+def _minimums(hashes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    SIGNATURE_HASHES x lists: the minimum of every hash function over
+    each list's run of hashes (the largest uint32 for empty runs).
+    """
+    minimums = np.full((SIGNATURE_HASHES, len(lengths)), np.iinfo(np.uint32).max, dtype=np.uint32)
+    present = lengths > 0
+    if len(hashes):
+        permuted = _MULTIPLIERS[:, None] * hashes[None, :] + _OFFSETS[:, None]
+        starts = (np.cumsum(lengths) - lengths)[present]
+        minimums[:, present] = np.minimum.reduceat(permuted, starts, axis=1)
+    return minimums
+
+
+def _signatures(minimums: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(minimums.T).astype(np.uint8)
+
+
+def _row_ids(start: int, end: int, shape: Tuple[int, int]) -> np.ndarray:
+    return np.broadcast_to(np.arange(start, end), shape)
+
+
+def _sorted_run(keys: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(keys, axis=1, kind="stable")
+    return np.take_along_axis(keys, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+
+def _matches(
+    sorted_keys: np.ndarray,
+    rows: np.ndarray,
+    needles: np.ndarray,
+    order: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (query position, row) for every needle found in sorted_keys;
+    needles are the query keys sorted, order their query positions.
+    """
+    starts = np.searchsorted(sorted_keys, needles, side="left")
+    counts = np.searchsorted(sorted_keys, needles, side="right") - starts
+
+    queries = np.repeat(order, counts)
+    offsets = np.arange(len(queries)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return queries, rows[np.repeat(starts, counts) + offsets]
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator
+
+from agents import BaseAgent
+from agents.minhash_index import NearDuplicateIndex, word_minhash_batch
+from stores.atomic import atomic_write
+from config import (
+    NEAR_DUPLICATE_BANDS, NEAR_DUPLICATE_MIN_TOKENS, NEAR_DUPLICATE_ROWS,
+    NEAR_DUPLICATE_THRESHOLD, NEAR_DUPLICATES_REPORT_NAME, OUTPUT_DIR
+)
+
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class NearDuplicateFilterAgent(BaseAgent):
+    def __init__(
+        self,
+        report_path: str = os.path.join(OUTPUT_DIR, NEAR_DUPLICATES_REPORT_NAME),
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        min_tokens: int = NEAR_DUPLICATE_MIN_TOKENS,
+        bands: int = NEAR_DUPLICATE_BANDS,
+        rows: int = NEAR_DUPLICATE_ROWS
+    ):
+        self.report_path = report_path
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self.bands = bands
+        self.rows = rows
+
+        # date -> {"reviews": n, "dropped": n}, for every day filtered
+        try:
+            with open(report_path, "r") as f:
+                self.stats: Dict[str, Dict[str, int]] = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            self.stats = {}
+
+    def run(self, reviews: List[Dict], date: str) -> List[Dict]:
+        """
+        Drops reviews that are near-duplicates (copy-pasted or
+        templated text) of an earlier review of the same day.
+
+        Input:
+            reviews = [
+                {"text": "cleaned text", "rating": 1, "hash": "..."},
+                ...
+            ]
+
+        Output:
+            reviews, without near-duplicates (same shape)
+        """
+
+        return list(self.run_stream(reviews=reviews, date=date))
+
+    def run_stream(self, reviews: Iterable[Dict], date: str) -> Iterator[Dict]:
+        """
+        Generator form of run(): signs BATCH_SIZE reviews at a
+        time against one index for the whole day. The day's counts are
+        saved once the stream is exhausted.
+        """
+        index = NearDuplicateIndex(self.threshold, self.bands, self.rows)
+        total = dropped = 0
+
+        reviews = iter(reviews)
+        while True:
+            batch = list(islice(reviews, BATCH_SIZE))
+            if not batch:
+                break
+            total += len(batch)
+
+            for review, duplicate in zip(batch, self._find_duplicates(batch, index)):
+                if duplicate:
+                    dropped += 1
+                else:
+                    yield review
+
+        self.stats[date] = {"reviews": total, "dropped": dropped}
+        self._save()
+        logger.info("Near-duplicate reviews dropped for %s: %d of %d", date, dropped, total)
+
+    # ---------- helpers ----------
+
+    def _find_duplicates(self, batch: List[Dict], index: NearDuplicateIndex) -> List[bool]:
+        """
+        Flags every review of batch at least threshold similar to a
+        review kept before it; the others are added to index.
+        Reviews shorter than min_tokens words are always kept: short
+        texts like "good app" are too common to be spam.
+        """
+        tokens = [(review.get("text", "") or "").split() for review in batch]
+        long_rows = [row for row, words in enumerate(tokens) if len(words) >= self.min_tokens]
+
+        duplicates = [False] * len(batch)
+        if not long_rows:
+            return duplicates
+
+        signatures = word_minhash_batch([tokens[row] for row in long_rows])
+        for row, duplicate in zip(long_rows, index.insert_batch(signatures).tolist()):
+            duplicates[row] = duplicate
+
+        return duplicates
+
+    def _save(self):
+        with atomic_write(self.report_path) as f:
+            json.dump(self.stats, f, indent=2)
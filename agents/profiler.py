@@ -0,0 +1,200 @@
+import csv
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict, Iterator, List
+
+PROFILE_FIELDS = [
+    "agent", "date", "wall_seconds", "cpu_seconds",
+    "peak_memory_bytes", "items_in", "items_out"
+]
+
+
+class RunProfiler:
+    """
+    Per-agent, per-day timings for one run.
+
+    BaseAgent wraps every subclass's run(), and the streaming entry
+    points (run_stream, count_stream, commit), with profiled(), which
+    costs a single flag check while the profiler is disabled.
+
+    Times are exclusive: a call pulling from a profiled stream (e.g.
+    count_stream consuming discovery's run_stream) or calling another
+    profiled method is not charged for the time spent in it, so the
+    stages of one streaming chain add up to the chain. A stream's
+    record covers every item pulled from it; its memory peak is left
+    to the outermost call, which sees the whole chain.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.records: List[Dict] = []
+        # Day being processed, for agents whose run() takes no date
+        self.current_date = None
+        # [wall start, cpu start, child wall, child cpu] per open call,
+        # per thread (batch mode ingests from a thread pool)
+        self._local = threading.local()
+
+    def enable(self, trace_memory: bool = True):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def measure(self, agent: str, run, instance, args, kwargs):
+        # Nested calls would reset the outer call's peak
+        trace_memory = self.trace_memory and not self._frames
+        if trace_memory:
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+
+        record = self._record(agent, kwargs)
+        kwargs = self._count_streamed(record, kwargs)
+
+        self._enter()
+        try:
+            result = run(instance, *args, **kwargs)
+        finally:
+            self._leave(record)
+
+        if trace_memory:
+            record["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - base_memory
+        record["items_in"] += self._count_items(list(args) + list(kwargs.values()))
+        record["items_out"] = self._count_items([result])
+        return result
+
+    def measure_stream(self, agent: str, run, instance, args, kwargs) -> Iterator:
+        """
+        Like measure() for a method returning an iterator: the record
+        accumulates the time of every next() on it and the items it
+        yields.
+        """
+        record = self._record(agent, kwargs)
+        kwargs = self._count_streamed(record, kwargs)
+
+        self._enter()
+        try:
+            items = iter(run(instance, *args, **kwargs))
+        finally:
+            self._leave(record)
+        return self._timed(record, items)
+
+    def summary(self) -> Dict[str, Dict]:
+        totals: Dict[str, Dict] = {}
+        for record in self.records:
+            agent = totals.setdefault(record["agent"], {
+                "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "peak_memory_bytes": 0
+            })
+            agent["calls"] += 1
+            agent["wall_seconds"] = round(agent["wall_seconds"] + record["wall_seconds"], 6)
+            agent["cpu_seconds"] = round(agent["cpu_seconds"] + record["cpu_seconds"], 6)
+            agent["peak_memory_bytes"] = max(
+                agent["peak_memory_bytes"], record["peak_memory_bytes"] or 0
+            )
+        return totals
+
+    def write(self, output_dir: str = "output"):
+        """
+        Writes run_profile.json (records + per-agent totals) and
+        run_profile.csv (one row per agent call) to output_dir.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        with open(os.path.join(output_dir, "run_profile.json"), "w") as f:
+            json.dump({"summary": self.summary(), "records": self.records}, f, indent=2)
+
+        with open(os.path.join(output_dir, "run_profile.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=PROFILE_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+    # ---------- helpers ----------
+
+    def _record(self, agent: str, kwargs: Dict) -> Dict:
+        record = {
+            "agent": agent,
+            "date": kwargs.get("date") or kwargs.get("target_date") or self.current_date,
+            "wall_seconds": 0.0,
+            "cpu_seconds": 0.0,
+            "peak_memory_bytes": None,
+            "items_in": 0,
+            "items_out": 0,
+        }
+        self.records.append(record)
+        return record
+
+    @property
+    def _frames(self) -> List[List[float]]:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    def _enter(self):
+        self._frames.append([time.perf_counter(), time.process_time(), 0.0, 0.0])
+
+    def _leave(self, record: Dict):
+        wall_start, cpu_start, child_wall, child_cpu = self._frames.pop()
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        record["wall_seconds"] = round(record["wall_seconds"] + wall - child_wall, 6)
+        record["cpu_seconds"] = round(record["cpu_seconds"] + cpu - child_cpu, 6)
+        if self._frames:
+            self._frames[-1][2] += wall
+            self._frames[-1][3] += cpu
+
+    def _timed(self, record: Dict, items: Iterator) -> Iterator:
+        while True:
+            self._enter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                self._leave(record)
+            record["items_out"] += 1
+            yield item
+
+    def _count_streamed(self, record: Dict, kwargs: Dict) -> Dict:
+        # Streams passed in are counted as they are consumed
+        return {
+            name: self._counted(record, value) if isinstance(value, Iterator) else value
+            for name, value in kwargs.items()
+        }
+
+    @staticmethod
+    def _counted(record: Dict, items: Iterator) -> Iterator:
+        for item in items:
+            record["items_in"] += 1
+            yield item
+
+    @staticmethod
+    def _count_items(values) -> int:
+        # Lists / dicts passed between agents are the "items"
+        return sum(len(v) for v in values if isinstance(v, (list, tuple, dict)))
+
+
+PROFILER = RunProfiler()
+
+
+def profiled(agent: str, run, stream: bool = False):
+    measure = PROFILER.measure_stream if stream else PROFILER.measure
+
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        if not PROFILER.enabled:
+            return run(self, *args, **kwargs)
+        return measure(agent, run, self, args, kwargs)
+
+    return wrapper
@@ -1,46 +1,131 @@
 import json
 import os
 import csv
+import heapq
+import html
+import numpy as np
+
 from agents import BaseAgent
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, List, Optional, Iterable
+from stores.trend_store import TrendStore, open_trend_store
+from stores.evidence_store import EvidenceStore
+from stores.rollup_store import RollupStore, GRANULARITIES
+from config import (
+    OUTPUT_DIR, REPORT_GRANULARITY, REPORT_RANK_BY, REPORT_TOP_K, WINDOW_DAYS
+)
 
+GRANULARITY_TITLES = {"day": "", "week": " (weekly)", "month": " (monthly)"}
 
-TREND_STORE_PATH = "storage/trend_store/trends.json"
-OUTPUT_DIR = "output"
-WINDOW_DAYS = 30
+# Columns counted as "recent" when ranking by recent volume (day reports;
+# weekly and monthly reports use their latest column)
+RECENT_DAYS = 7
 
 
 class ReportGeneratorAgent(BaseAgent):
-    def __init__(self):
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
+    def __init__(
+        self,
+        trend_store: Optional[TrendStore] = None,
+        output_dir: str = OUTPUT_DIR,
+        evidence: Optional[EvidenceStore] = None,
+        rollups: Optional[RollupStore] = None,
+        granularity: str = REPORT_GRANULARITY,
+        top_k: int = REPORT_TOP_K,
+        rank_by: str = REPORT_RANK_BY
+    ):
+        if granularity != "day" and granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown report granularity: {granularity}")
+        if rank_by not in ("total", "recent"):
+            raise ValueError(f"Unknown report ranking: {rank_by}")
+
+        self.output_dir = output_dir
+        self.trend_store = trend_store or open_trend_store()
+
+        # Weekly / monthly columns come from the rollups only; daily
+        # cells are not read for them
+        self.granularity = granularity
+        self.rollups = rollups or (RollupStore() if granularity != "day" else None)
+
+        # Optional example reviews shown under each topic in the HTML
+        self.evidence = evidence
+
+        # HTML dashboard: the top_k topics (0 = all) by total volume or
+        # by volume over the most recent columns
+        self.top_k = top_k
+        self.rank_by = rank_by
+
+        # Last rendered report, kept for incremental updates:
+        # topic names and their topics x columns count matrix
+        self._dates = []
+        self._topics = []
+        self._counts = np.zeros((0, 0), dtype=np.int64)
 
     def run(self, target_date: str):
-        trend_store = self._load_trend_store()
         date_columns = self._generate_date_range(target_date)
 
-        # Build full report
-        json_report = {}
-        for topic, date_counts in trend_store.items():
-            json_report[topic] = {
-                d: date_counts.get(d, 0) for d in date_columns
-            }
+        if self.granularity != "day":
+            date_columns = self.rollups.buckets(
+                self.granularity, date_columns[0], date_columns[-1]
+            )
+            self._topics, self._counts = self.rollups.matrix(self.granularity, date_columns)
+        else:
+            # Build full report
+            self._topics, self._counts = self.trend_store.matrix(date_columns)
+
+        self._dates = date_columns
+        self._write_reports()
+
+    def update(self, target_date: str, changed_topics: Iterable[str]):
+        """
+        Incremental variant of run() for live reports: shifts the date
+        columns by one day and re-reads only the rows of topics
+        counted on target_date. Falls back to a full run() when the
+        previous report is not exactly the day before, and for weekly
+        or monthly reports, which are only a few rollup columns.
+        """
+        if self.granularity != "day":
+            return self.run(target_date)
+
+        date_columns = self._generate_date_range(target_date)
+
+        if not self._dates or self._dates[1:] != date_columns[:-1]:
+            return self.run(target_date)
+
+        counts = np.zeros((len(self._topics), len(date_columns)), dtype=np.int64)
+        counts[:, :-1] = self._counts[:, 1:]
 
-        # Filter out topics with all-zero values
+        changed_topics = list(changed_topics)
+        if changed_topics:
+            fresh_topics, fresh = self.trend_store.matrix(date_columns, topics=changed_topics)
+            fresh_rows = dict(zip(fresh_topics, fresh))
+
+            row_index = {topic: i for i, topic in enumerate(self._topics)}
+            new_topics = [t for t in dict.fromkeys(changed_topics) if t not in row_index]
+            counts = np.vstack([counts, np.zeros((len(new_topics), len(date_columns)), dtype=np.int64)])
+            for topic in new_topics:
+                row_index[topic] = len(self._topics)
+                self._topics.append(topic)
+
+            for topic in changed_topics:
+                counts[row_index[topic]] = fresh_rows.get(topic, 0)
+
+        self._dates = date_columns
+        self._counts = counts
+        self._write_reports()
+
+    def _write_reports(self):
+        # Filter out topics with all-zero values (one vectorized row test)
+        keep = np.flatnonzero((self._counts > 0).any(axis=1))
         filtered_report = {
-            topic: counts
-            for topic, counts in json_report.items()
-            if any(value > 0 for value in counts.values())
+            self._topics[row]: dict(zip(self._dates, values))
+            for row, values in zip(keep, self._counts[keep].tolist())
         }
 
-        # Write outputs
+        # Write outputs; the dashboard shows the top_k ranked topics
+        os.makedirs(self.output_dir, exist_ok=True)
         self._write_json(filtered_report)
-        self._write_csv(filtered_report, date_columns)
-        self._write_html(filtered_report, date_columns)
-
-    def _load_trend_store(self) -> Dict:
-        with open(TREND_STORE_PATH, "r") as f:
-            return json.load(f)
+        self._write_csv(filtered_report, self._dates)
+        self._write_html(self._rank(keep), len(keep))
 
     def _generate_date_range(self, target_date: str):
         end = datetime.strptime(target_date, "%Y-%m-%d").date()
@@ -55,13 +140,13 @@ class ReportGeneratorAgent(BaseAgent):
         return dates
 
     def _write_json(self, report: Dict):
-        path = os.path.join(OUTPUT_DIR, "trend_report.json")
+        path = os.path.join(self.output_dir, "trend_report.json")
         with open(path, "w") as f:
             json.dump(report, f, indent=2)
         return path
 
     def _write_csv(self, report: Dict, dates):
-        path = os.path.join(OUTPUT_DIR, "trend_report.csv")
+        path = os.path.join(self.output_dir, "trend_report.csv")
 
         with open(path, "w", newline="") as f:
             writer = csv.writer(f)
@@ -72,13 +157,72 @@ class ReportGeneratorAgent(BaseAgent):
 
         return os.path.abspath(path)
 
-    def _write_html(self, report: Dict, dates):
-        path = os.path.join(OUTPUT_DIR, "trend_report.html")
+    def _write_html(self, rows: List[int], total_topics: int):
+        """
+        The dashboard: one compact JSON block with the ranked rows,
+        rendered a page at a time by a small script, so the page stays
+        light however many topics there are. Written in one call.
+        """
+        path = os.path.join(self.output_dir, "trend_report.html")
+
+        data = {
+            "columns": self._dates,
+            "topics": [self._topics[row] for row in rows],
+            "counts": self._counts[rows].tolist(),
+            "examples": self._examples(self._topics[row] for row in rows),
+            "total_topics": total_topics,
+        }
+        # "</" would end the script element early
+        payload = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+
+        title = f"{WINDOW_DAYS}-Day Trend Report{GRANULARITY_TITLES[self.granularity]}"
+        page = "".join([
+            "<html><head><meta charset=\"utf-8\"><title>Trend Report</title>",
+            "<style>", HTML_STYLE, "</style></head><body>",
+            f"<h2>{html.escape(title)}</h2>",
+            "<div class=\"toolbar\">",
+            "<input id=\"filter\" type=\"search\" placeholder=\"Filter topics\">",
+            "<button id=\"prev\">&lt;</button><span id=\"status\"></span>",
+            "<button id=\"next\">&gt;</button></div>",
+            "<table><thead id=\"head\"></thead><tbody id=\"rows\"></tbody></table>",
+            f"<script type=\"application/json\" id=\"trend-data\">{payload}</script>",
+            f"<script>\n{HTML_SCRIPT}</script></body></html>",
+        ])
 
         with open(path, "w", encoding="utf-8") as f:
-            f.write("<html><head><title>Trend Report</title>")
-            f.write("""
-                <style>
+            f.write(page)
+
+        return os.path.abspath(path)
+
+    def _rank(self, rows: np.ndarray) -> List[int]:
+        """
+        The top_k rows by total volume, or by volume over the most
+        recent columns, highest first (heap selection, O(n log k)).
+        """
+        if self.rank_by == "recent":
+            recent = RECENT_DAYS if self.granularity == "day" else 1
+            scores = self._counts[:, -recent:].sum(axis=1)
+        else:
+            scores = self._counts.sum(axis=1)
+
+        scores = scores.tolist()
+        rows = rows.tolist()
+        if not self.top_k:
+            return sorted(rows, key=scores.__getitem__, reverse=True)
+        return heapq.nlargest(self.top_k, rows, key=scores.__getitem__)
+
+    def _examples(self, topics: Iterable[str]) -> Dict[str, Dict]:
+        if not self.evidence:
+            return {}
+
+        return {
+            topic: {"samples": self.evidence.samples(topic), "count": self.evidence.count(topic)}
+            for topic in topics
+            if self.evidence.samples(topic)
+        }
+
+
+HTML_STYLE = """
     body {
         font-family: "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
         background-color: #f8f9f8;
@@ -135,29 +279,93 @@ class ReportGeneratorAgent(BaseAgent):
         background-color: #f1f4f1;
     }
 
+    .examples {
+        margin: 8px 0 4px;
+        padding-left: 18px;
+        font-weight: 400;
+        font-size: 12px;
+        color: #56605a;
+    }
+
     tr:hover {
         background-color: #e2e8e2 !important;
         transition: background-color 0.2s ease;
     }
-</style>
-            """)
-            f.write("</head><body>")
-            f.write("<h2>30-Day Trend Report</h2>")
-            f.write("<table>")
-
-            # Header
-            f.write("<tr><th>Topic</th>")
-            for d in dates:
-                f.write(f"<th>{d}</th>")
-            f.write("</tr>")
-
-            # Rows
-            for topic, counts in report.items():
-                f.write(f"<tr><td>{topic}</td>")
-                for d in dates:
-                    f.write(f"<td>{counts[d]}</td>")
-                f.write("</tr>")
-
-            f.write("</table></body></html>")
 
-        return os.path.abspath(path)
+    .toolbar {
+        display: flex;
+        gap: 12px;
+        align-items: center;
+        margin-bottom: 16px;
+        font-size: 14px;
+    }
+
+    .toolbar input {
+        padding: 6px 10px;
+        border: 1px solid #cfd8cf;
+        border-radius: 6px;
+    }
+"""
+
+HTML_SCRIPT = """
+(function () {
+    var data = JSON.parse(document.getElementById("trend-data").textContent);
+    var PAGE_SIZE = 50;
+    var page = 0;
+    var visible = data.topics.map(function (_, i) { return i; });
+
+    function esc(value) {
+        return String(value).replace(/[&<>"']/g, function (c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", "\\"": "&quot;", "'": "&#39;"}[c];
+        });
+    }
+
+    function topicCell(topic) {
+        var ex = data.examples[topic];
+        if (!ex) {
+            return esc(topic);
+        }
+        var items = ex.samples.map(function (text) { return "<li>" + esc(text) + "</li>"; });
+        return "<details><summary>" + esc(topic) + "</summary>" +
+            "<ul class=\\"examples\\">" + items.join("") + "</ul>" +
+            "<small>" + ex.samples.length + " of " + ex.count + " matching reviews</small></details>";
+    }
+
+    function render() {
+        var pages = Math.max(1, Math.ceil(visible.length / PAGE_SIZE));
+        page = Math.min(Math.max(page, 0), pages - 1);
+        var first = page * PAGE_SIZE;
+
+        var html = [];
+        visible.slice(first, first + PAGE_SIZE).forEach(function (i) {
+            html.push("<tr><td>" + topicCell(data.topics[i]) + "</td><td>" +
+                data.counts[i].join("</td><td>") + "</td></tr>");
+        });
+        document.getElementById("rows").innerHTML = html.join("");
+
+        document.getElementById("status").textContent =
+            (visible.length ? first + 1 : 0) + "-" + Math.min(first + PAGE_SIZE, visible.length) +
+            " of " + visible.length + " topics" +
+            (data.total_topics > data.topics.length ? " (top " + data.topics.length + " of " + data.total_topics + ")" : "");
+    }
+
+    document.getElementById("head").innerHTML = "<tr><th>Topic</th>" +
+        data.columns.map(function (c) { return "<th>" + esc(c) + "</th>"; }).join("") + "</tr>";
+
+    document.getElementById("filter").addEventListener("input", function (e) {
+        var query = e.target.value.toLowerCase();
+        visible = [];
+        data.topics.forEach(function (topic, i) {
+            if (topic.toLowerCase().indexOf(query) !== -1) {
+                visible.push(i);
+            }
+        });
+        page = 0;
+        render();
+    });
+    document.getElementById("prev").addEventListener("click", function () { page -= 1; render(); });
+    document.getElementById("next").addEventListener("click", function () { page += 1; render(); });
+
+    render();
+})();
+"""
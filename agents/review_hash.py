@@ -0,0 +1,20 @@
+import hashlib
+from typing import Dict
+
+
+def hash_review(review: Dict) -> str:
+    """
+    Identity of a cleaned review (text + rating), shared by
+    discovery and counting so both agree on which review is which.
+    CleanerMemoryAgent stores it as review["hash"], so it is computed
+    once per review.
+    """
+    if "hash" in review:
+        return review["hash"]
+
+    return review_digest(review.get("text", ""), review.get("rating", ""))
+
+
+def review_digest(text: str, rating) -> str:
+    """The digest behind hash_review(), for callers that already hold the fields."""
+    return hashlib.md5((text + str(rating)).encode("utf-8")).hexdigest()
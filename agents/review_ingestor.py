@@ -1,34 +1,375 @@
+import logging
+from datetime import date as date_cls, timedelta
+
 from agents import BaseAgent
-from google_play_scraper import reviews, Sort
+from typing import List, Dict, Optional, Callable, Tuple
+from stores.raw_review_cache import RawReviewCache
+from config import INGEST_MAX_PAGES
+
+PAGE_SIZE = 100
+
+# google_play_scraper.Sort.NEWEST.value; reviews are always paged
+# newest first
+SORT_NEWEST = 2
+
+logger = logging.getLogger(__name__)
+
+
+class ResumedToken:
+    """
+    Continuation token rebuilt from a saved cursor, with the fields
+    google_play_scraper.reviews reads back from its own tokens.
+    """
+
+    __slots__ = (
+        "token", "lang", "country", "sort", "count",
+        "filter_score_with", "filter_device_with"
+    )
+
+    def __init__(self, token, count: int):
+        self.token = token
+        self.lang = "en"
+        self.country = "in"
+        self.sort = SORT_NEWEST
+        self.count = count
+        self.filter_score_with = None
+        self.filter_device_with = None
+
+
+def play_store_reviews(app_id: str, **kwargs):
+    """
+    google_play_scraper.reviews, newest first. The scraper and its
+    HTTP stack are imported on the first request, so replayed and
+    offline runs never load them.
+    """
+    from google_play_scraper import reviews, Sort
+
+    return reviews(app_id, sort=Sort.NEWEST, **kwargs)
 
 
 class ReviewIngestorAgent(BaseAgent):
-    def run(self, app_id: str, date: str, day_index: int = 0):
-        print(f"[Ingestor] Fetching REAL reviews for batch {date}")
-
-        collected = []
-        continuation_token = None
-
-        pages_to_skip = day_index 
-
-        for i in range(pages_to_skip + 1):
-            result, continuation_token = reviews(
-                app_id,
-                lang="en",
-                country="in",
-                sort=Sort.NEWEST,
-                count=100,
-                continuation_token=continuation_token
+    def __init__(
+        self,
+        cache: Optional[RawReviewCache] = None,
+        replay: bool = False,
+        fetch_reviews: Optional[Callable] = None,
+        page_size: int = PAGE_SIZE,
+        max_pages: int = INGEST_MAX_PAGES
+    ):
+        # Every fetched page is written through to the raw cache.
+        # In replay mode pages are served from the cache only and
+        # no request is sent to Google Play.
+        self.cache = cache or RawReviewCache()
+        self.replay = replay
+
+        # Anything with google_play_scraper.reviews' signature, e.g.
+        # the local stand-in in benchmarks/fake_play_store.py
+        self.fetch_reviews = fetch_reviews or play_store_reviews
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+        # Number of page requests sent to Google Play since construction
+        self.pages_fetched = 0
+
+        # Persistent NEWEST-first cursor. Pages before _cached_pages
+        # are read back from the raw cache (after a resume). _tokens is
+        # the cache session's cursor map, saved once paging stops, and
+        # _spans the [newest, oldest] review day of each of its pages.
+        self._app_id = None
+        self._session: Optional[str] = None
+        self._tokens: List[Optional[str]] = []
+        self._spans: List[Optional[List[str]]] = []
+        self._session_changed = False
+        self._continuation_token = None
+        self._next_page = 0
+        self._exhausted = False
+        self._cached_pages = 0
+
+        # Pages read for the current range, against max_pages; once it
+        # is capped the range is never paged again
+        self._pages_read = 0
+        self._capped = False
+
+        # Calendar day (of the `at` timestamp) -> [first, last] page
+        # holding its reviews. Reviews stay in the raw cache until
+        # their day is asked for, so a long range is never held in
+        # memory. Also the oldest day paged through so far, the newest
+        # day kept and the last page read back.
+        self._day_pages: Dict[str, List[int]] = {}
+        self._oldest: Optional[str] = None
+        self._end: Optional[str] = None
+        self._last_page: Tuple[Optional[int], List[Dict]] = (None, [])
+
+    def run(
+        self,
+        app_id: str,
+        date: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Reviews posted on date (by their `at` timestamp). The first
+        call pages back to start (default: date) in one pass and
+        indexes which pages hold each day, so later days of the range
+        are read back from the raw cache without another request.
+
+        Output:
+            reviews = [
+                {"text": "...", "rating": 1, "at": "2024-10-01T09:30:00"},
+                ...
+            ]
+        """
+        source = "CACHED" if self.replay else "REAL"
+        logger.info("Fetching %s reviews for batch %s", source, date)
+
+        if not self._covers(app_id, date):
+            self.fetch_range(app_id, start or date, end)
+
+        if self._capped and (self._oldest is None or date <= self._oldest):
+            logger.warning(
+                "Reviews of %s for %s are incomplete: paging stopped after %d pages",
+                app_id, date, self.max_pages
             )
 
-            if not continuation_token:
-                break
+        pages = self._day_pages.pop(date, None)
+        if pages is None:
+            return []
 
-        # Collect only this batch's page
-        for r in result:
-            collected.append({
+        first, last = pages
+        return [
+            {
                 "text": r["content"],
-                "rating": r["score"]
-            })
+                "rating": r["score"],
+                "at": r["at"] if isinstance(r["at"], str) else r["at"].isoformat()
+            }
+            for page_index in range(first, last + 1)
+            for r in self._read_page(page_index)
+            if _review_day(r) == date
+        ]
+
+    def fetch_range(self, app_id: str, start: str, end: Optional[str] = None) -> int:
+        """
+        Pages NEWEST-first from the cursor until the oldest review on
+        a page is older than start, indexing the pages of every day up
+        to end (all if None). Returns the number of pages read.
+
+        At most max_pages are read for the whole range, however many
+        calls it takes; once capped, days from the oldest one reached
+        back to start stay incomplete.
+        """
+        if app_id != self._app_id:
+            self._reset_cursor(app_id)
+        self._end = end
+
+        if self.replay and self._session is None:
+            self._open_cached_session(start)
+
+        pages = 0
+        try:
+            while not self._exhausted and (self._oldest is None or self._oldest >= start):
+                if self._pages_read >= self.max_pages:
+                    self._capped = True
+                    logger.warning(
+                        "Stopped paging %s after %d pages: days from %s back to %s are incomplete",
+                        app_id, self._pages_read, self._oldest or end, start
+                    )
+                    break
+
+                page_index = self._next_page
+                span = self._fetch_next_page()
+                pages += 1
+                self._pages_read += 1
+                if span is None:
+                    break
+
+                newest, oldest = span
+                self._index_days(page_index, newest if end is None else min(newest, end), oldest)
+                self._oldest = oldest if self._oldest is None else min(self._oldest, oldest)
+        finally:
+            # Also after a network error, so a resume continues the session
+            self._save_session()
+
+        logger.info("Read %d pages of %s back to %s", pages, app_id, self._oldest)
+        return pages
+
+    def cursor(self) -> Dict:
+        """
+        Position after the last fetched page, as saved in the run
+        manifest.
+        """
+        token = self._continuation_token
+        return {
+            "session": self._session,
+            "next_page": self._next_page,
+            "token": None if token is None else token.token,
+            "exhausted": self._exhausted,
+        }
+
+    def restore_cursor(self, app_id: str, cursor: Dict):
+        """
+        Resumes from a saved cursor: pages before it are read back
+        from its raw cache session to refill the days, and paging
+        continues from the saved token, into the same session, without
+        repeating any request.
+        """
+        self._reset_cursor(app_id)
+
+        session = cursor["session"]
+        data = self.cache.load_session(app_id, session) if session else None
+        if data is None or len(data["tokens"]) < cursor["next_page"]:
+            logger.warning("Raw review cache of %s does not hold the saved cursor; paging afresh", app_id)
+            return
+
+        self._session = session
+        # Replay reads on through the session; a live run appends to it
+        self._tokens = data["tokens"] if self.replay else data["tokens"][:cursor["next_page"]]
+        self._spans = data["spans"][:len(self._tokens)]
+        self._cached_pages = cursor["next_page"]
+        if cursor["token"] is not None:
+            self._continuation_token = ResumedToken(cursor["token"], self.page_size)
+
+    def resume_session(self, app_id: str) -> bool:
+        """
+        Continues app_id's latest raw cache session where its paging
+        stopped, e.g. a fetch interrupted before any day was
+        checkpointed. Returns False if there is nothing to continue.
+        """
+        session = self.cache.latest_session(app_id)
+        tokens = self.cache.load_session(app_id, session)["tokens"] if session else []
+        if not tokens:
+            return False
+
+        self.restore_cursor(app_id, {
+            "session": session,
+            "next_page": len(tokens),
+            "token": tokens[-1],
+            "exhausted": tokens[-1] is None
+        })
+        return True
+
+    # ---------- helpers ----------
+
+    def _covers(self, app_id: str, date: str) -> bool:
+        # Days after end were paged through but not kept; a capped
+        # range has been read as far as it will be
+        if app_id != self._app_id:
+            return False
+        if self._capped:
+            return True
+        if self._end is not None and date > self._end:
+            return True
+        return self._exhausted or (self._oldest is not None and self._oldest < date)
+
+    def _reset_cursor(self, app_id: str):
+        self._app_id = app_id
+        self._session = None
+        self._tokens = []
+        self._spans = []
+        self._session_changed = False
+        self._continuation_token = None
+        self._next_page = 0
+        self._exhausted = False
+        self._cached_pages = 0
+        self._pages_read = 0
+        self._capped = False
+        self._day_pages = {}
+        self._oldest = None
+        self._end = None
+        self._last_page = (None, [])
+
+    def _fetch_next_page(self) -> Optional[List[str]]:
+        """
+        Fetches (or replays) the next page into the raw cache and
+        returns its [newest, oldest] review day; None once there are
+        no more reviews.
+        """
+        page_index = self._next_page
+        self._next_page += 1
+
+        if self._exhausted:
+            return None
+
+        if self.replay or page_index < self._cached_pages:
+            return self._replay_page(page_index)
+
+        result, self._continuation_token = self.fetch_reviews(
+            self._app_id,
+            lang="en",
+            country="in",
+            count=self.page_size,
+            continuation_token=self._continuation_token
+        )
+        self.pages_fetched += 1
+
+        if not self._continuation_token or self._continuation_token.token is None:
+            self._exhausted = True
+
+        if self._session is None:
+            self._session = self.cache.new_session(self._app_id)
+        self.cache.save_page(self._app_id, self._session, page_index, result)
+        self._tokens.append(None if self._exhausted else self._continuation_token.token)
+        self._spans.append(_span(result))
+        self._session_changed = True
+
+        return self._spans[-1]
+
+    def _replay_page(self, page_index: int) -> Optional[List[str]]:
+        if page_index >= len(self._tokens):
+            logger.warning("No cached page %d for %s", page_index, self._app_id)
+            self._exhausted = True
+            return None
+
+        if self._tokens[page_index] is None:
+            self._exhausted = True
+        return self._spans[page_index]
+
+    def _read_page(self, page_index: int) -> List[Dict]:
+        # Consecutive days share their boundary page
+        if self._last_page[0] != page_index:
+            page = self.cache.load_page(self._app_id, self._session, page_index)
+            if page is None:
+                logger.warning("No cached page %d for %s", page_index, self._app_id)
+            self._last_page = (page_index, page or [])
+        return self._last_page[1]
+
+    def _index_days(self, page_index: int, newest: str, oldest: str):
+        day = date_cls.fromisoformat(oldest)
+        while day.isoformat() <= newest:
+            pages = self._day_pages.setdefault(day.isoformat(), [page_index, page_index])
+            pages[0] = min(pages[0], page_index)
+            pages[1] = max(pages[1], page_index)
+            day += timedelta(days=1)
+
+    def _open_cached_session(self, start: str):
+        self._session = self.cache.find_session(self._app_id, start)
+        if self._session is None:
+            logger.warning("No cached pages for %s", self._app_id)
+            self._exhausted = True
+            return
+
+        data = self.cache.load_session(self._app_id, self._session)
+        self._tokens = data["tokens"]
+        self._spans = data["spans"]
+        logger.info("Replaying raw review session %s of %s", self._session, self._app_id)
+
+    def _save_session(self):
+        if self._session_changed:
+            self.cache.save_session(
+                self._app_id, self._session, self._tokens, self._spans, self._oldest
+            )
+            self._session_changed = False
+
+
+def _review_day(review: Dict) -> str:
+    # `at` is a datetime from google_play_scraper, an ISO string
+    # when read back from the raw cache
+    at = review["at"]
+    return at[:10] if isinstance(at, str) else at.date().isoformat()
+
 
-        return collected
+def _span(page: List[Dict]) -> Optional[List[str]]:
+    """[newest, oldest] review day on a page, None if it is empty."""
+    if not page:
+        return None
+    days = [_review_day(review) for review in page]
+    return [max(days), min(days)]
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from agents import BaseAgent
+from stores.trend_store import TrendStore, open_trend_store
+from config import (
+    ALERTS_REPORT_NAME, OUTPUT_DIR, SPIKE_BASELINE_DAYS, SPIKE_EWMA_ALPHA,
+    SPIKE_MIN_COUNT, SPIKE_MIN_HISTORY, SPIKE_Z_THRESHOLD, WINDOW_DAYS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SpikeDetectorAgent(BaseAgent):
+    def __init__(
+        self,
+        trend_store: Optional[TrendStore] = None,
+        output_dir: str = OUTPUT_DIR,
+        baseline_days: int = SPIKE_BASELINE_DAYS,
+        z_threshold: float = SPIKE_Z_THRESHOLD,
+        min_count: int = SPIKE_MIN_COUNT,
+        min_history: int = SPIKE_MIN_HISTORY,
+        ewma_alpha: float = SPIKE_EWMA_ALPHA
+    ):
+        self.trend_store = trend_store or open_trend_store()
+        self.output_dir = output_dir
+
+        # The baseline has to fit in the stored window next to today
+        self.baseline_days = min(baseline_days, WINDOW_DAYS - 1)
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.min_history = min_history
+        self.ewma_alpha = ewma_alpha
+
+    def run(self, date: str) -> List[Dict]:
+        """
+        Scores every topic's count on date against its previous
+        baseline_days in one pass over the trend matrix.
+
+        Output (also written to output/trend_alerts.json):
+            alerts = [
+                {
+                    "topic": "Payment failure",
+                    "count": 42,
+                    "zscore": 6.1,
+                    "mean": 7.5,
+                    "std": 5.6,
+                    "growth": 2.5,
+                    "ewma": 9.2
+                },
+                ...
+            ]  (highest z-score first)
+        """
+        end = datetime.strptime(date, "%Y-%m-%d").date()
+        dates = [
+            (end - timedelta(days=offset)).isoformat()
+            for offset in range(self.baseline_days, -1, -1)
+        ]
+        topics, counts = self.trend_store.matrix(dates)
+        counts = counts.astype(np.float64)
+
+        # Days on which nothing at all was counted are treated as
+        # missing (before the run started), not as zero baselines
+        history = counts[:, :-1]
+        history = history[:, history.any(axis=0)]
+        today = counts[:, -1]
+
+        alerts = []
+        if history.shape[1] >= self.min_history:
+            alerts = self._score(topics, history, today)
+
+        self._write_alerts(date, alerts)
+        logger.info("Spike alerts for %s: %d", date, len(alerts))
+        return alerts
+
+    # ---------- helpers ----------
+
+    def _score(self, topics: List[str], history: np.ndarray, today: np.ndarray) -> List[Dict]:
+        mean = history.mean(axis=1)
+        # A flat history has std 0; one review is the smallest step
+        std = np.maximum(history.std(axis=1), 1.0)
+        zscore = (today - mean) / std
+
+        yesterday = history[:, -1]
+        growth = (today - yesterday) / np.maximum(yesterday, 1.0)
+
+        # EWMA of the baseline, newest day weighted alpha, as a matrix
+        # product: s = (1-a)^(n-1) x0 + sum a (1-a)^(n-1-i) xi
+        n = history.shape[1]
+        weights = self.ewma_alpha * (1 - self.ewma_alpha) ** np.arange(n - 1, -1, -1)
+        weights[0] = (1 - self.ewma_alpha) ** (n - 1)
+        ewma = history @ weights
+
+        flagged = np.flatnonzero((zscore >= self.z_threshold) & (today >= self.min_count))
+        ranked = flagged[np.argsort(-zscore[flagged], kind="stable")]
+
+        return [
+            {
+                "topic": topics[row],
+                "count": int(today[row]),
+                "zscore": round(float(zscore[row]), 3),
+                "mean": round(float(mean[row]), 3),
+                "std": round(float(std[row]), 3),
+                "growth": round(float(growth[row]), 3),
+                "ewma": round(float(ewma[row]), 3),
+            }
+            for row in ranked
+        ]
+
+    def _write_alerts(self, date: str, alerts: List[Dict]):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, ALERTS_REPORT_NAME)
+        with open(path, "w") as f:
+            json.dump({"date": date, "alerts": alerts}, f, indent=2)
+        return path
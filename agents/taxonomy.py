@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import pickle
+from typing import Dict, List, Tuple
+
+from agents.keyword_matcher import KeywordMatcher, Rule
+from stores.atomic import atomic_write
+from config import KEYWORD_TOPICS_PATH, SEED_TOPICS_PATH, TAXONOMY_CACHE_PATH
+
+# Bump when Taxonomy or KeywordMatcher change shape, so artifacts
+# pickled by an older version are rebuilt instead of loaded
+TAXONOMY_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+# source hash -> taxonomy already loaded by this process
+_loaded: Dict[str, "Taxonomy"] = {}
+
+
+class Taxonomy:
+    """
+    Seed topics, keyword topic rules and the KeywordMatcher compiled
+    from both: seed topics first, then keyword topics, first match
+    wins.
+    """
+
+    def __init__(self, seed_topics: List[str], keyword_topics: List[Rule]):
+        self.seed_topics = seed_topics
+        self.keyword_topics = keyword_topics
+        self.matcher = KeywordMatcher(
+            [(topic, topic.lower().split(), []) for topic in seed_topics]
+            + keyword_topics
+        )
+
+
+def load_taxonomy(
+    seed_path: str = SEED_TOPICS_PATH,
+    keyword_path: str = KEYWORD_TOPICS_PATH,
+    cache_path: str = TAXONOMY_CACHE_PATH
+) -> Taxonomy:
+    """
+    The compiled taxonomy for the current source files. It is read
+    from the pickled artifact at cache_path when that was built from
+    the same sources by the same TAXONOMY_VERSION, and otherwise
+    compiled and written there. Within a process it is loaded once.
+
+    Raises FileNotFoundError when the seed topics file is missing.
+    """
+    try:
+        with open(seed_path, "rb") as f:
+            seed_source = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError("Seed topics file missing") from None
+
+    try:
+        with open(keyword_path, "rb") as f:
+            keyword_source = f.read()
+    except FileNotFoundError:
+        keyword_source = b"[]"
+
+    source_hash = hashlib.sha256(
+        b"%d\0%s\0%s" % (TAXONOMY_VERSION, seed_source, keyword_source)
+    ).hexdigest()
+
+    taxonomy = _loaded.get(source_hash)
+    if taxonomy is None:
+        taxonomy = _read_artifact(cache_path, source_hash)
+        if taxonomy is None:
+            taxonomy = _compile(seed_source, keyword_source)
+            _write_artifact(cache_path, source_hash, taxonomy)
+        _loaded[source_hash] = taxonomy
+
+    return taxonomy
+
+
+# ---------- helpers ----------
+
+def _compile(seed_source: bytes, keyword_source: bytes) -> Taxonomy:
+    keyword_topics: List[Tuple[str, List[str], List[str]]] = [
+        (rule["topic"], rule["primary"], rule["secondary"])
+        for rule in json.loads(keyword_source)
+    ]
+    logger.info("Compiling topic taxonomy")
+    return Taxonomy(json.loads(seed_source), keyword_topics)
+
+
+def _read_artifact(cache_path: str, source_hash: str):
+    try:
+        with open(cache_path, "rb") as f:
+            artifact = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (EOFError, ValueError, pickle.UnpicklingError, AttributeError, ImportError):
+        # Torn or written by incompatible code: rebuilt
+        return None
+
+    if (
+        not isinstance(artifact, dict)
+        or artifact.get("version") != TAXONOMY_VERSION
+        or artifact.get("source_hash") != source_hash
+    ):
+        return None
+    return artifact["taxonomy"]
+
+
+def _write_artifact(cache_path: str, source_hash: str, taxonomy: Taxonomy):
+    with atomic_write(cache_path, "wb") as f:
+        pickle.dump(
+            {"version": TAXONOMY_VERSION, "source_hash": source_hash, "taxonomy": taxonomy},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
@@ -1,96 +1,153 @@
-import json
-import os
-import hashlib
 from agents import BaseAgent
-from typing import List, Dict
+from agents.topic_deduplicator import TopicDeduplicatorAgent
+from itertools import islice
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 from datetime import datetime, timedelta
+from stores.trend_store import TrendStore, open_trend_store
+from stores.seen_review_store import SeenReviewStore
+from stores.rollup_store import RollupStore
+from stores.trend_version import TrendVersion
+from stores.evidence_store import EvidenceStore
+from config import WINDOW_DAYS
 
-TREND_STORE_PATH = "storage/trend_store/trends.json"
-SEEN_REVIEWS_PATH = "storage/review_store/seen_reviews.json"
-WINDOW_DAYS = 30
+STREAM_CHUNK_SIZE = 10_000
 
 
 class TopicCounterAgent(BaseAgent):
-    def __init__(self):
-        os.makedirs("storage/trend_store", exist_ok=True)
-        os.makedirs("storage/review_store", exist_ok=True)
-
-        if not os.path.exists(TREND_STORE_PATH):
-            with open(TREND_STORE_PATH, "w") as f:
-                json.dump({}, f)
-
-        if not os.path.exists(SEEN_REVIEWS_PATH):
-            with open(SEEN_REVIEWS_PATH, "w") as f:
-                json.dump([], f)
-
-    def run(self, reviews: List[Dict], topics: Dict, date: str):
-        trend_store = self._safe_load(TREND_STORE_PATH)
-        seen_reviews = set(self._safe_load(SEEN_REVIEWS_PATH))
-
-        for topic in topics:
-            trend_store.setdefault(topic, {})
-            trend_store[topic][date] = 0
-
-        new_seen = set()
-
-        for review in reviews:
-            review_hash = self._hash_review(review)
-
-            # DEDUPLICATION
-            if review_hash in seen_reviews:
-                continue
-
-            matched_topic = self._match_review_to_topic(
-                review["text"], topics
-            )
-
-            if matched_topic:
-                trend_store[matched_topic][date] += 1
-
-            new_seen.add(review_hash)
-
-        # Update seen reviews
-        seen_reviews.update(new_seen)
-
-        self._apply_sliding_window(trend_store, date)
-
-        self._safe_write(TREND_STORE_PATH, trend_store)
-        self._safe_write(SEEN_REVIEWS_PATH, list(seen_reviews))
+    def __init__(
+        self,
+        trend_store: Optional[TrendStore] = None,
+        seen_reviews: Optional[SeenReviewStore] = None,
+        rollups: Optional[RollupStore] = None,
+        version: Optional[TrendVersion] = None,
+        evidence: Optional[EvidenceStore] = None,
+        deduplicator: Optional[TopicDeduplicatorAgent] = None
+    ):
+        self.trend_store = trend_store or open_trend_store()
+        # An empty store is falsy (it has a length)
+        self.seen_reviews = seen_reviews if seen_reviews is not None else SeenReviewStore()
+        self.rollups = rollups or RollupStore()
+        self.version = version or TrendVersion()
+        # Example reviews per candidate topic, offered only the reviews
+        # counted here; not collected without a store
+        self.evidence = evidence
+        # Candidate topics are resolved exactly as they were merged
+        self.deduplicator = deduplicator or TopicDeduplicatorAgent()
+
+    def run(self, candidate_topics: List[Dict], topics: Dict, date: str) -> Dict[str, int]:
+        """
+        Aggregates the per-review assignment made by
+        TopicDiscoveryAgent; reviews are not matched again here.
+        Candidates carry no texts, so no evidence is sampled; the
+        streaming path (count_stream) does that.
+
+        Input:
+            candidate_topics = [
+                {"topic": "...", "review_hashes": [...]}
+            ]
+            topics = canonical topic store from TopicDeduplicatorAgent
+
+        Output:
+            day_counts = {"Delivery issue": 12, ...}
+        """
+        assignments = (
+            (candidate["topic"], review_hash, None)
+            for candidate in candidate_topics
+            for review_hash in candidate["review_hashes"]
+        )
+        candidate_counts = self.count_stream(assignments=assignments, date=date)
+        return self.commit(candidate_counts=candidate_counts, topics=topics, date=date)
+
+    def count_stream(
+        self,
+        assignments: Iterable[Tuple[str, str, Optional[str]]],
+        date: str,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """
+        Consumes (candidate topic, review hash, text) assignments, e.g.
+        from TopicDiscoveryAgent.run_stream, checking them against the
+        seen store one chunk at a time. Each review is counted once,
+        and only counted reviews are offered as evidence, so a topic's
+        evidence count never runs ahead of its trend count.
+
+        Output:
+            candidate_counts = {"Delivery issue": 12, ...}
+            (every candidate topic seen, including zero counts)
+        """
+        candidate_counts: Dict[str, int] = {}
+
+        for chunk in self._chunks(assignments, chunk_size):
+            # DEDUPLICATION (one batch lookup per chunk)
+            review_hashes = [review_hash for _, review_hash, _ in chunk]
+            already_seen = self.seen_reviews.contains(review_hashes)
+
+            new_seen = []
+            counted = set()
+            for (topic, review_hash, text), seen in zip(chunk, already_seen):
+                candidate_counts.setdefault(topic, 0)
+                if seen or review_hash in counted:
+                    continue
+
+                candidate_counts[topic] += 1
+                counted.add(review_hash)
+                new_seen.append(review_hash)
+                if self.evidence is not None and text is not None:
+                    self.evidence.offer(topic, text)
+
+            # Update seen reviews
+            self.seen_reviews.add(new_seen, date)
+
+        # One merge into the sorted digests for the whole day
+        self.seen_reviews.flush()
+        return candidate_counts
+
+    def commit(self, candidate_counts: Dict[str, int], topics: Dict, date: str) -> Dict[str, int]:
+        """
+        Resolves candidate topics to canonical ones (through the
+        deduplicator, whose registry topics is) and writes the day's
+        cells to the trend store and its weekly / monthly
+        rollups, then bumps the trend version so readers (the query
+        service) drop what they cached.
+        """
+        day_counts = {topic: 0 for topic in topics}
+
+        for candidate_topic, count in candidate_counts.items():
+            matched_topic = self.deduplicator.resolve(candidate_topic)
+            if matched_topic is not None:
+                day_counts[matched_topic] += count
+
+        # A re-counted day replaces its cells; rollups take the difference
+        previous = {
+            topic: date_counts.get(date, 0)
+            for topic, date_counts in self.trend_store.window([date], topics=day_counts).items()
+        }
+
+        # Only this day's cells are written
+        self.trend_store.record_day(date, day_counts)
+        self.rollups.add_day(date, day_counts, previous)
+        self._apply_sliding_window(date)
+        self.trend_store.flush()
+        self.rollups.save()
+        self.version.bump(date)
+
+        return day_counts
 
     # ---------- helpers ----------
 
-    def _hash_review(self, review: Dict) -> str:
-        text = review.get("text", "")
-        rating = str(review.get("rating", ""))
-        raw = (text + rating).encode("utf-8")
-        return hashlib.md5(raw).hexdigest()
-
-    def _match_review_to_topic(self, text: str, topics: Dict) -> str | None:
-        text_lower = text.lower()
-
-        for topic in topics:
-            if any(word in text_lower for word in topic.lower().split()):
-                return topic
-
-        return None
+    @staticmethod
+    def _chunks(items: Iterable, size: int) -> Iterator[List]:
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, size))
+            if not chunk:
+                return
+            yield chunk
 
-    def _apply_sliding_window(self, trend_store: Dict, date: str):
+    def _apply_sliding_window(self, date: str):
         current = datetime.strptime(date, "%Y-%m-%d").date()
         cutoff = current - timedelta(days=WINDOW_DAYS)
 
-        for topic in trend_store:
-            for d in list(trend_store[topic].keys()):
-                if datetime.strptime(d, "%Y-%m-%d").date() < cutoff:
-                    del trend_store[topic][d]
-
-    def _safe_load(self, path: str):
-        try:
-            with open(path, "r") as f:
-                content = f.read().strip()
-                return json.loads(content) if content else {}
-        except:
-            return {}
-
-    def _safe_write(self, path: str, data):
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        self.trend_store.prune(cutoff.isoformat())
+        self.rollups.prune(cutoff.isoformat())
+        self.seen_reviews.expire(cutoff.isoformat())
@@ -1,31 +1,37 @@
-import json
-import os
 from agents import BaseAgent
-from typing import List, Dict
-
-
-TOPIC_STORE_PATH = "storage/topic_store/topics.json"
+from agents.minhash_index import MinHashIndex
+from agents.taxonomy import load_taxonomy
+from stores.topic_registry import TopicRegistry
+from typing import List, Dict, Optional
+from config import DEDUP_FUZZY_MATCHING, DEDUP_FUZZY_THRESHOLD, TOPIC_STORE_PATH
 
 
 class TopicDeduplicatorAgent(BaseAgent):
-    def __init__(self):
-        seed_path = "storage/topic_store/seed_topics.json"
-        if os.path.exists(seed_path):
-            with open(seed_path, "r") as f:
-                seed_topics = json.load(f)
+    def __init__(
+        self,
+        topic_store_path: str = TOPIC_STORE_PATH,
+        fuzzy: bool = DEDUP_FUZZY_MATCHING,
+        fuzzy_threshold: float = DEDUP_FUZZY_THRESHOLD,
+        registry: Optional[TopicRegistry] = None
+    ):
+        # The canonical topics; a registry shared with the rest of the
+        # run is passed in, otherwise one is loaded from topic_store_path
+        self.topic_store = registry if registry is not None else TopicRegistry(topic_store_path)
 
-            topic_store = self._load_topic_store()
+        # normalized topic / alias -> canonical topic id (exact hits),
+        # kept in step with the registry
+        self._index: Dict[str, int] = {}
+        self._alias_sets: List[set] = []
 
-            for topic in seed_topics:
-                if topic not in topic_store:
-                    topic_store[topic] = {
-                        "aliases": [],
-                        "created_on": self._today(),
-                        "last_updated": self._today()
-                    }
+        # Optional near-duplicate matching on character n-grams
+        self._fuzzy_index = MinHashIndex(threshold=fuzzy_threshold) if fuzzy else None
 
-            self._save_topic_store(topic_store)
+        for topic_id, canonical_topic in enumerate(self.topic_store.names):
+            self._index_topic(topic_id, canonical_topic, self.topic_store.record(topic_id)["aliases"])
 
+        # Seed topics are added on first use and written with the
+        # next run(), so constructing the agent writes nothing
+        self._seeded = False
 
     def run(self, candidate_topics: List[Dict]) -> Dict:
         """
@@ -33,7 +39,7 @@ class TopicDeduplicatorAgent(BaseAgent):
             candidate_topics = [
                 {
                     "topic": "delivery guy shouted",
-                    "evidence": [...]
+                    "review_hashes": [...]
                 }
             ]
 
@@ -47,96 +53,93 @@ class TopicDeduplicatorAgent(BaseAgent):
             }
         """
 
-        topic_store = self._load_topic_store()
+        self._add_seed_topics()
 
         for candidate in candidate_topics:
             candidate_topic = candidate["topic"]
 
-            matched_topic = self._find_match(candidate_topic, topic_store)
+            matched_id = self._find_match(candidate_topic)
 
-            if matched_topic:
+            if matched_id is not None:
                 # Merge into existing topic
-                self._merge_alias(
-                    topic_store,
-                    matched_topic,
-                    candidate_topic
-                )
+                self._merge_alias(matched_id, candidate_topic)
             else:
                 # Create new canonical topic
-                self._create_new_topic(topic_store, candidate_topic)
+                self._create_new_topic(candidate_topic)
 
-        self._save_topic_store(topic_store)
-        return topic_store
+        # Only what changed today is written
+        self.topic_store.commit()
+        return self.topic_store
 
-    def _load_topic_store(self) -> Dict:
-        try:
-            with open(TOPIC_STORE_PATH, "r") as f:
-                content = f.read().strip()
-                if not content:
-                    return {}
-                return json.loads(content)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
-
-
-    def _save_topic_store(self, topic_store: Dict):
-        with open(TOPIC_STORE_PATH, "w") as f:
-            json.dump(topic_store, f, indent=2)
-
-    def _find_match(self, candidate_topic: str, topic_store: Dict) -> str:
+    def resolve(self, candidate_topic: str) -> Optional[str]:
         """
-        Decide if candidate_topic matches any existing canonical topic.
-        Returns canonical topic name or None.
+        Canonical topic a candidate name was (or would be) merged into.
         """
+        self._add_seed_topics()
+        matched_id = self._find_match(candidate_topic)
+        return None if matched_id is None else self.topic_store.name_of(matched_id)
 
-        for canonical_topic, data in topic_store.items():
-            if self._is_semantically_same(candidate_topic, canonical_topic, data["aliases"]):
-                return canonical_topic
+    def _add_seed_topics(self):
+        if self._seeded:
+            return
+        self._seeded = True
 
-        return None
+        try:
+            seed_topics = load_taxonomy().seed_topics
+        except FileNotFoundError:
+            return
 
-    def _is_semantically_same(
-        self,
-        candidate: str,
-        canonical: str,
-        aliases: List[str]
-    ) -> bool:
+        for topic in seed_topics:
+            if topic not in self.topic_store:
+                self._create_new_topic(topic)
+
+    def _find_match(self, candidate_topic: str) -> Optional[int]:
         """
-        Placeholder semantic matcher.
-        Replace with LLM reasoning later.
+        Decide if candidate_topic matches any existing canonical topic.
+        Returns canonical topic id or None.
+
+        Exact (normalized) names and aliases are a single hash lookup;
+        with fuzzy matching on, near-duplicates are looked up in the
+        MinHash index.
         """
+        key = self._normalize(candidate_topic)
 
-        # Very simple normalization for now
-        candidate_norm = candidate.lower()
-        canonical_norm = canonical.lower()
+        matched_id = self._index.get(key)
+        if matched_id is None and self._fuzzy_index is not None:
+            matched_id = self._fuzzy_index.query(key)
 
-        if candidate_norm == canonical_norm:
-            return True
+        return matched_id
 
-        for alias in aliases:
-            if candidate_norm == alias.lower():
-                return True
-        return False
+    def _merge_alias(self, canonical_id: int, new_alias: str):
+        alias_set = self._alias_sets[canonical_id]
 
-    def _merge_alias(
-        self,
-        topic_store: Dict,
-        canonical_topic: str,
-        new_alias: str
-    ):
-        aliases = topic_store[canonical_topic]["aliases"]
+        if new_alias not in alias_set:
+            self.topic_store.add_alias(canonical_id, new_alias)
+            alias_set.add(new_alias)
+            self._index_key(new_alias, canonical_id)
 
-        if new_alias not in aliases:
-            aliases.append(new_alias)
+        self.topic_store.touch(canonical_id, self._today())
 
-        topic_store[canonical_topic]["last_updated"] = self._today()
+    def _create_new_topic(self, topic: str):
+        topic_id = self.topic_store.add(topic, self._today())
+        self._index_topic(topic_id, topic, [])
 
-    def _create_new_topic(self, topic_store: Dict, topic: str):
-        topic_store[topic] = {
-            "aliases": [],
-            "created_on": self._today(),
-            "last_updated": self._today()
-        }
+    def _index_topic(self, topic_id: int, canonical_topic: str, aliases: List[str]):
+        self._alias_sets.append(set(aliases))
+        self._index_key(canonical_topic, topic_id)
+        for alias in aliases:
+            self._index_key(alias, topic_id)
+
+    def _index_key(self, name: str, topic_id: int):
+        # First writer wins, matching the old in-order scan of the store
+        key = self._normalize(name)
+        self._index.setdefault(key, topic_id)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(key, self._index[key])
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return " ".join(name.lower().split())
 
     def _today(self) -> str:
         from datetime import date
@@ -1,120 +1,79 @@
 from agents import BaseAgent
-from typing import List, Dict, Optional
-import json
+from agents.keyword_matcher import KeywordMatcher, Rule
+from agents.review_hash import hash_review
+from agents.taxonomy import Taxonomy, load_taxonomy
+from typing import List, Dict, Iterable, Iterator, Tuple, Optional
+from config import SEED_TOPICS_PATH
 import os
 
-SEED_TOPIC_PATH = "storage/topic_store/seed_topics.json"
-
 
 class TopicDiscoveryAgent(BaseAgent):
     def __init__(self):
-        if not os.path.exists(SEED_TOPIC_PATH):
+        if not os.path.exists(SEED_TOPICS_PATH):
             raise FileNotFoundError("Seed topics file missing")
 
-        with open(SEED_TOPIC_PATH, "r") as f:
-            self.seed_topics = json.load(f)
-
-        # Canonical keyword topics (no semantic duplication)
-        self.keyword_topics = [
-            
-            ("App stability & performance issues",
-             ["app", "application"],
-             ["crash", "freeze", "hang", "lag", "slow", "bug", "glitch"]),
-
-            ("Login / authentication issue",
-             ["login", "signin", "otp", "verification"],
-             ["fail", "error", "issue"]),
-
-            ("Issue after app update",
-             ["update"],
-             ["issue", "problem", "broke", "worse"]),
-
-            # Payments
-            ("Payment failure",
-             ["payment", "upi", "card", "netbanking"],
-             ["fail", "error", "declined"]),
-
-            ("Refund not received",
-             ["refund", "money"],
-             ["not received", "pending", "delay"]),
-
-            ("Incorrect charges",
-             ["charged", "deducted", "double", "extra charge", "hidden fee"],
-             []),
-
-            # Pricing
-            ("High pricing concerns",
-             ["price", "cost", "expensive", "costly"],
-             []),
-
-            # Customer Support (not delivery partner behavior)
-            ("Customer support issue",
-             ["support", "customer care", "helpdesk"],
-             ["rude", "bad", "unhelpful", "no response", "ignored"]),
-
-            # Account & Policy
-            ("Account suspension issue",
-             ["account", "profile"],
-             ["blocked", "suspended"]),
-
-            ("Unfair policy concern",
-             ["policy", "rules", "terms"],
-             ["unfair", "bad"]),
-
-            # Feature Requests 
-            ("Feature request",
-             ["add", "feature", "should have", "wish", "bring back", "old version", "remove"],
-             [])
-        ]
+        # Seed and keyword topics (storage/topic_store/*.json) come
+        # compiled from the taxonomy artifact, loaded on first use
+        self._taxonomy: Optional[Taxonomy] = None
+
+    @property
+    def taxonomy(self) -> Taxonomy:
+        if self._taxonomy is None:
+            self._taxonomy = load_taxonomy()
+        return self._taxonomy
+
+    @property
+    def seed_topics(self) -> List[str]:
+        return self.taxonomy.seed_topics
+
+    @property
+    def keyword_topics(self) -> List[Rule]:
+        return self.taxonomy.keyword_topics
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        return self.taxonomy.matcher
 
     def run(self, reviews: List[Dict]) -> List[Dict]:
         """
         Discovers topics from reviews.
         Only returns seed or valid evolved topics.
         Unmatched reviews are ignored.
+
+        Each candidate carries the hashes of the reviews assigned to
+        it, so TopicCounterAgent can aggregate without re-matching.
+        No texts are kept: example reviews are sampled from run_stream
+        by the counter, for the reviews it counts.
         """
 
-        discovered: Dict[str, List[str]] = {}
+        assigned: Dict[str, List[str]] = {}
 
-        for review in reviews:
-            text = review.get("text", "")
-            if not text:
-                continue
-
-            topic = self._match_seed_topic(text) or self._match_keyword_topic(text)
-            if not topic:
-                continue
-
-            discovered.setdefault(topic, []).append(text)
+        for topic, review in self._assign(reviews):
+            assigned.setdefault(topic, []).append(hash_review(review))
 
         return [
-            {"topic": topic, "evidence": evidence}
-            for topic, evidence in discovered.items()
+            {"topic": topic, "review_hashes": review_hashes}
+            for topic, review_hashes in assigned.items()
         ]
 
-    def _match_seed_topic(self, text: str) -> Optional[str]:
+    def run_stream(self, reviews: Iterable[Dict]) -> Iterator[Tuple[str, str, str]]:
         """
-        Canonical matching for seed topics
+        Generator form of run(): yields one (topic, review hash, text)
+        assignment per matched review, the text for the counter's
+        evidence.
         """
-        text_lower = text.lower()
-
-        for topic in self.seed_topics:
-            keywords = topic.lower().split()
-            if any(k in text_lower for k in keywords):
-                return topic
+        for topic, review in self._assign(reviews):
+            yield topic, hash_review(review), review["text"]
 
-        return None
-
-    def _match_keyword_topic(self, text: str) -> Optional[str]:
-        """
-        Keyword-based evolving topic detection
-        (guaranteed non-overlapping with seed topics)
-        """
-        text_lower = text.lower()
+    def _assign(self, reviews: Iterable[Dict]) -> Iterator[Tuple[str, Dict]]:
+        matcher = self.matcher
+        for review in reviews:
+            text = review.get("text", "")
+            if not text:
+                continue
 
-        for topic, primary_keys, secondary_keys in self.keyword_topics:
-            if any(p in text_lower for p in primary_keys):
-                if not secondary_keys or any(s in text_lower for s in secondary_keys):
-                    return topic
+            topic = matcher.match(text)
+            if not topic:
+                continue
 
-        return None
+            yield topic, review
@@ -0,0 +1,92 @@
+"""
+Throughput of CleanerMemoryAgent's batch normalization.
+
+    python -m benchmarks.cleaner
+    python -m benchmarks.cleaner --reviews 1000000 --target 200000
+
+Compares clean_batch() against the previous per-review regex cleaner
+(plus the separate hashing pass discovery used to do) on the
+synthetic corpus, checks both produce the same reviews, and writes
+benchmarks/results/cleaner-<timestamp>.json. Exits with status 1 when
+clean_batch misses the target throughput.
+"""
+import argparse
+import re
+import sys
+import time
+
+from agents.cleaner_memory import CleanerMemoryAgent
+from agents.review_hash import hash_review
+from benchmarks.synthetic import SyntheticReviewGenerator
+from benchmarks.results import write_results
+
+# reviews/sec clean_batch should sustain on the synthetic corpus
+TARGET_REVIEWS_PER_SECOND = 150_000
+
+
+def regex_clean(reviews):
+    cleaned_reviews = []
+    for review in reviews:
+        text = review.get("text", "")
+        text = text.lower()
+        text = re.sub(r"[^a-z0-9\s]", " ", text)
+        text = re.sub(r"\s+", " ", text)
+        text = text.strip()
+        if text:
+            cleaned = {"text": text, "rating": review.get("rating", None)}
+            cleaned["hash"] = hash_review(cleaned)
+            cleaned_reviews.append(cleaned)
+    return cleaned_reviews
+
+
+def measure(fn, reviews, repeat: int):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(reviews)
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cleaner throughput benchmark")
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target", type=float, default=TARGET_REVIEWS_PER_SECOND)
+    args = parser.parse_args()
+
+    reviews = SyntheticReviewGenerator().cleaner_input(args.reviews)
+    cleaner = CleanerMemoryAgent()
+
+    expected, regex_seconds = measure(regex_clean, reviews, args.repeat)
+    cleaned, batch_seconds = measure(cleaner.clean_batch, reviews, args.repeat)
+    assert cleaned == expected, "clean_batch disagrees with the regex cleaner"
+
+    throughput = args.reviews / batch_seconds
+    result = {
+        "scenario": "cleaner",
+        "reviews": args.reviews,
+        "regex_seconds": round(regex_seconds, 4),
+        "batch_seconds": round(batch_seconds, 4),
+        "regex_reviews_per_second": round(args.reviews / regex_seconds, 1),
+        "batch_reviews_per_second": round(throughput, 1),
+        "speedup": round(regex_seconds / batch_seconds, 2),
+        "target_reviews_per_second": args.target,
+        "meets_target": throughput >= args.target,
+    }
+
+    print(
+        f"regex {result['regex_reviews_per_second']} reviews/s, "
+        f"batch {result['batch_reviews_per_second']} reviews/s "
+        f"({result['speedup']}x), target {args.target:.0f}: "
+        f"{'met' if result['meets_target'] else 'MISSED'}"
+    )
+    print("Results written to", write_results("cleaner", [result]))
+    if not result["meets_target"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
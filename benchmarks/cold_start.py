@@ -0,0 +1,129 @@
+"""
+Benchmark: pipeline cold start, the fixed cost every scheduled run
+pays before its first review.
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --runs 20 --keyword-topics 0 2000
+
+Every run is a fresh interpreter in a throw-away workspace that
+imports DailyController, constructs it and loads the topic taxonomy
+(what the first day needs before it can match). "cold" runs start
+without the compiled taxonomy artifact, "warm" runs reuse it. Each
+run also reports whether google_play_scraper was imported and whether
+constructing the controller wrote any file.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.results import write_results
+from benchmarks.workspace import REPO_ROOT, workspace
+from config import KEYWORD_TOPICS_PATH, TAXONOMY_CACHE_PATH
+
+CHILD = """
+import json, os, sys, time
+started = time.perf_counter()
+
+def files():
+    return {os.path.join(d, f) for d, _, names in os.walk(".") for f in names}
+
+from orchestrator.daily_controller import DailyController
+imported = time.perf_counter()
+
+before = files()
+controller = DailyController(replay=True)
+constructed = time.perf_counter()
+written = sorted(files() - before)
+
+controller.discovery.matcher
+loaded = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - started,
+    "construct": constructed - imported,
+    "taxonomy": loaded - constructed,
+    "scraper_imported": "google_play_scraper" in sys.modules,
+    "constructor_writes": written,
+}))
+"""
+
+
+def write_keyword_topics(count: int):
+    """Replaces the workspace's keyword topics with count synthetic rules."""
+    rules = [
+        {
+            "topic": f"Synthetic topic {i}",
+            "primary": [f"primary{i}a", f"primary{i}b"],
+            "secondary": [f"secondary{i}a", f"secondary{i}b", f"secondary{i}c"],
+        }
+        for i in range(count)
+    ]
+    with open(KEYWORD_TOPICS_PATH, "w") as f:
+        json.dump(rules, f)
+
+
+def run_child() -> dict:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    started = time.perf_counter()
+    output = subprocess.check_output([sys.executable, "-c", CHILD], env=env, text=True)
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - started
+    return result
+
+
+def measure(keyword_topics: int, cache: str, runs: int) -> dict:
+    with workspace():
+        if keyword_topics:
+            write_keyword_topics(keyword_topics)
+        if cache == "warm":
+            run_child()
+
+        samples = []
+        for _ in range(runs):
+            if cache == "cold" and os.path.exists(TAXONOMY_CACHE_PATH):
+                os.remove(TAXONOMY_CACHE_PATH)
+            samples.append(run_child())
+
+    result = {
+        "keyword_topics": keyword_topics or "repo",
+        "cache": cache,
+        "runs": runs,
+        "scraper_imported": any(s["scraper_imported"] for s in samples),
+        "constructor_writes": sorted({f for s in samples for f in s["constructor_writes"]}),
+    }
+    for stage in ("import", "construct", "taxonomy", "process"):
+        result[f"{stage}_ms"] = round(statistics.median(s[stage] for s in samples) * 1000, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline cold start benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--keyword-topics", type=int, nargs="+", default=[0, 2000],
+        help="Synthetic keyword taxonomy sizes (0 = the repo's own)"
+    )
+    args = parser.parse_args()
+
+    results = []
+    for keyword_topics in args.keyword_topics:
+        for cache in ("cold", "warm"):
+            result = measure(keyword_topics, cache, args.runs)
+            print(
+                f"{str(result['keyword_topics']):>5} topics, {cache}: "
+                f"process {result['process_ms']}ms (import {result['import_ms']}ms, "
+                f"construct {result['construct_ms']}ms, taxonomy {result['taxonomy_ms']}ms)"
+                f"{', scraper imported' if result['scraper_imported'] else ''}"
+                f"{', constructor wrote files' if result['constructor_writes'] else ''}"
+            )
+            results.append(result)
+
+    print("Results written to", write_results("cold_start", results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Local stand-in for google_play_scraper.reviews with the same
+signature, pagination and continuation-token behaviour.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from benchmarks.synthetic import SyntheticReviewGenerator
+
+
+class FakeContinuationToken:
+    __slots__ = ("token", "lang", "country", "sort", "count")
+
+    def __init__(self, token, lang, country, sort, count):
+        self.token = token
+        self.lang = lang
+        self.country = country
+        self.sort = sort
+        self.count = count
+
+
+class FakePlayStore:
+    """
+    Serves `total_reviews` synthetic reviews, newest first, spread
+    evenly over `days` days ending at `newest`. Pages are generated on
+    demand, so a million-review store costs no memory up front.
+    """
+
+    def __init__(
+        self,
+        total_reviews: int,
+        days: int = 30,
+        newest: datetime = datetime(2024, 10, 31, 23, 59),
+        generator: Optional[SyntheticReviewGenerator] = None
+    ):
+        self.total_reviews = total_reviews
+        self.newest = newest
+        self.spacing = timedelta(days=days) / max(total_reviews, 1)
+        self.generator = generator or SyntheticReviewGenerator()
+
+        # Number of reviews() calls served
+        self.calls = 0
+
+    def reviews(
+        self,
+        app_id: str,
+        lang: str = "en",
+        country: str = "us",
+        sort=None,
+        count: int = 100,
+        filter_score_with: int = None,
+        filter_device_with: int = None,
+        continuation_token: FakeContinuationToken = None
+    ):
+        if continuation_token is not None:
+            if continuation_token.token is None:
+                return [], continuation_token
+            offset = continuation_token.token
+            count = continuation_token.count
+        else:
+            offset = 0
+
+        self.calls += 1
+
+        count = max(0, min(count, self.total_reviews - offset))
+        page = self.generator.batch(offset, count, self.newest, self.spacing)
+
+        next_offset = offset + count
+        token = next_offset if next_offset < self.total_reviews else None
+        return page, FakeContinuationToken(token, lang, country, sort, count)
@@ -0,0 +1,150 @@
+"""
+Benchmark: NearDuplicateFilterAgent (batched MinHash + LSH bands)
+vs. comparing every review with every review kept before it.
+
+    python -m benchmarks.near_duplicates
+    python -m benchmarks.near_duplicates --sizes 10000 100000 --brute-limit 10000
+    python -m benchmarks.near_duplicates --threshold 0.5
+
+Each run takes one synthetic day of cleaned reviews and injects
+review-bomb bursts: copies of a few template reviews with one word
+changed. Recall is the share of injected copies that were dropped;
+"dropped" also counts organic reviews close enough to be filtered.
+The benchmark fails (exit status 1) when recall is below RECALL_FLOOR.
+The pairwise reference uses the same signatures, so the share of its
+decisions the filter makes too shows what the LSH bands miss.
+"""
+import argparse
+import random
+import sys
+import time
+from typing import List, Dict
+
+import numpy as np
+
+from agents.cleaner_memory import CleanerMemoryAgent
+from agents.near_duplicate_filter import NearDuplicateFilterAgent
+from agents.minhash_index import SIGNATURE_HASHES, word_minhash_batch
+from benchmarks.results import write_results
+from benchmarks.synthetic import SyntheticReviewGenerator
+from benchmarks.workspace import workspace
+from config import NEAR_DUPLICATE_MIN_TOKENS, NEAR_DUPLICATE_THRESHOLD
+
+BURST_RATE = 0.05
+BURST_SIZE = 50
+TEMPLATE_WORDS = 15
+RECALL_FLOOR = 0.9
+SEED = 3
+
+
+def make_day(size: int) -> List[Dict]:
+    """size cleaned reviews; injected copies carry "burst": True."""
+    generator = SyntheticReviewGenerator(seed=SEED, duplicate_rate=0.0)
+    reviews = CleanerMemoryAgent().run(reviews=generator.cleaner_input(size), date="")
+
+    rng = random.Random(SEED)
+    vocabulary = sorted({word for review in reviews for word in review["text"].split()})
+
+    for _ in range(int(size * BURST_RATE) // BURST_SIZE):
+        template = rng.choices(vocabulary, k=TEMPLATE_WORDS)
+        for _ in range(BURST_SIZE):
+            words = list(template)
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            position = rng.randrange(len(reviews) + 1)
+            reviews.insert(position, {"text": " ".join(words), "rating": 1, "burst": True})
+
+    return reviews
+
+
+def brute_force(reviews: List[Dict], threshold: float, min_tokens: int) -> List[bool]:
+    """Reference: every signature against every one kept before it."""
+    tokens = [review["text"].split() for review in reviews]
+    rows = [row for row, words in enumerate(tokens) if len(words) >= min_tokens]
+    signatures = word_minhash_batch([tokens[row] for row in rows])
+
+    duplicates = [False] * len(reviews)
+    kept = np.empty((len(rows), SIGNATURE_HASHES), dtype=np.uint8)
+    size = 0
+    for row, signature in zip(rows, signatures):
+        agreeing = (kept[:size] == signature).sum(axis=1)
+        if (agreeing >= threshold * SIGNATURE_HASHES).any():
+            duplicates[row] = True
+        else:
+            kept[size] = signature
+            size += 1
+    return duplicates
+
+
+def measure(size: int, brute: bool, threshold: float) -> dict:
+    reviews = make_day(size)
+    injected = sum(1 for review in reviews if review.get("burst"))
+
+    with workspace():
+        agent = NearDuplicateFilterAgent(threshold=threshold)
+        started = time.perf_counter()
+        kept = agent.run(reviews=reviews, date="2024-10-31")
+        seconds = time.perf_counter() - started
+
+    kept_ids = {id(review) for review in kept}
+    dropped_bursts = sum(
+        1 for review in reviews if review.get("burst") and id(review) not in kept_ids
+    )
+
+    result = {
+        "reviews": len(reviews),
+        "threshold": threshold,
+        "injected": injected,
+        "dropped": len(reviews) - len(kept),
+        "recall": round(dropped_bursts / injected, 3) if injected else None,
+        "seconds": round(seconds, 4),
+        "reviews_per_second": round(len(reviews) / seconds, 1),
+        "recall_floor": RECALL_FLOOR,
+    }
+    result["meets_floor"] = result["recall"] is not None and result["recall"] >= RECALL_FLOOR
+
+    if brute:
+        started = time.perf_counter()
+        expected = brute_force(reviews, threshold, NEAR_DUPLICATE_MIN_TOKENS)
+        result["brute_seconds"] = round(time.perf_counter() - started, 4)
+        result["speedup"] = round(result["brute_seconds"] / seconds, 1)
+        same = sum(
+            (id(review) not in kept_ids) == duplicate for review, duplicate in zip(reviews, expected)
+        )
+        result["pairwise_agreement"] = round(same / len(reviews), 4)
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate filter benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--brute-limit", type=int, default=20_000,
+        help="Largest size also run against the quadratic reference"
+    )
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD)
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        result = measure(size, brute=size <= args.brute_limit, threshold=args.threshold)
+        line = (
+            f"{result['reviews']:>8} reviews: {result['seconds']}s, "
+            f"{result['dropped']} dropped, burst recall {result['recall']} "
+            f"(floor {RECALL_FLOOR}: {'met' if result['meets_floor'] else 'MISSED'})"
+        )
+        if "brute_seconds" in result:
+            line += (
+                f", pairwise {result['brute_seconds']}s, {result['speedup']}x, "
+                f"{result['pairwise_agreement']:.2%} same decisions"
+            )
+        print(line)
+        results.append(result)
+
+    print("Results written to", write_results("near_duplicates", results))
+    if not all(result["meets_floor"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
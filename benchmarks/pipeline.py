@@ -0,0 +1,129 @@
+"""
+Offline throughput benchmarks for the full pipeline.
+
+    python -m benchmarks.pipeline                       # 1k, 100k, 1M reviews
+    python -m benchmarks.pipeline --sizes 1000 100000   # smaller sweep
+
+Runs DailyController end-to-end against FakePlayStore, then each
+agent on its own over one synthetic day, and writes the results to
+benchmarks/results/pipeline-<timestamp>.json.
+"""
+import argparse
+import math
+import time
+from datetime import timedelta
+
+from agents.profiler import PROFILER
+from agents.review_ingestor import ReviewIngestorAgent
+from agents.cleaner_memory import CleanerMemoryAgent
+from agents.near_duplicate_filter import NearDuplicateFilterAgent
+from agents.topic_discovery import TopicDiscoveryAgent
+from agents.topic_deduplicator import TopicDeduplicatorAgent
+from agents.topic_counter import TopicCounterAgent
+from agents.report_generator import ReportGeneratorAgent
+from orchestrator.daily_controller import DailyController
+from benchmarks.fake_play_store import FakePlayStore
+from benchmarks.synthetic import SyntheticReviewGenerator
+from benchmarks.results import write_results
+from benchmarks.workspace import workspace
+
+APP_ID = "bench.synthetic.app"
+
+
+def end_to_end(total_reviews: int, days: int) -> dict:
+    store = FakePlayStore(total_reviews, days=days)
+    start = store.newest.date() - timedelta(days=days - 1)
+
+    PROFILER.enable(trace_memory=False)
+    try:
+        with workspace():
+            started = time.perf_counter()
+
+            controller = DailyController()
+            controller.ingestor = ReviewIngestorAgent(
+                fetch_reviews=store.reviews,
+                page_size=math.ceil(total_reviews / days)
+            )
+
+            dates = [(start + timedelta(days=offset)).isoformat() for offset in range(days)]
+            controller.run_days(app_link=APP_ID, dates=dates)
+
+            seconds = time.perf_counter() - started
+    finally:
+        agents = PROFILER.summary()
+        PROFILER.records.clear()
+        PROFILER.disable()
+
+    return {
+        "scenario": "end_to_end",
+        "reviews": total_reviews,
+        "days": days,
+        "seconds": round(seconds, 3),
+        "reviews_per_second": round(total_reviews / seconds, 1),
+        "pages_fetched": store.calls,
+        "agents": agents,
+    }
+
+
+def per_agent(review_count: int) -> dict:
+    reviews = SyntheticReviewGenerator().cleaner_input(review_count)
+    date = "2024-10-31"
+    timings = {}
+
+    def timed(name, fn, **kwargs):
+        started = time.perf_counter()
+        result = fn(**kwargs)
+        timings[name] = round(time.perf_counter() - started, 4)
+        return result
+
+    with workspace():
+        cleaned = timed("CleanerMemoryAgent", CleanerMemoryAgent().run, reviews=reviews, date=date)
+        distinct = timed(
+            "NearDuplicateFilterAgent", NearDuplicateFilterAgent().run, reviews=cleaned, date=date
+        )
+        candidates = timed("TopicDiscoveryAgent", TopicDiscoveryAgent().run, reviews=distinct)
+        deduplicator = TopicDeduplicatorAgent()
+        topics = timed("TopicDeduplicatorAgent", deduplicator.run, candidate_topics=candidates)
+        timed(
+            "TopicCounterAgent", TopicCounterAgent(deduplicator=deduplicator).run,
+            candidate_topics=candidates, topics=topics, date=date
+        )
+        timed("ReportGeneratorAgent", ReportGeneratorAgent().run, target_date=date)
+
+    return {
+        "scenario": "per_agent",
+        "reviews": review_count,
+        "seconds": timings,
+        "reviews_per_second": {
+            name: round(review_count / seconds, 1) if seconds else None
+            for name, seconds in timings.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--agent-reviews", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        result = end_to_end(size, args.days)
+        print(
+            f"end_to_end {size:>9} reviews: {result['seconds']:>8}s "
+            f"({result['reviews_per_second']} reviews/s, {result['pages_fetched']} pages)"
+        )
+        results.append(result)
+
+    result = per_agent(args.agent_reviews)
+    for name, seconds in result["seconds"].items():
+        print(f"{name:<24} {args.agent_reviews} reviews: {seconds}s")
+    results.append(result)
+
+    print("Results written to", write_results("pipeline", results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Load test: the query service (main.py --serve) over a synthetic run,
+checked against latency targets.
+
+    python -m benchmarks.query_service
+    python -m benchmarks.query_service --topics 20000 --clients 8 --requests 400
+
+Each run commits WINDOW_DAYS days of Poisson counts for that many
+topics through TopicCounterAgent, starts the HTTP server on a free
+local port in a child process and replays a dashboard-like mix of
+/series, /top and /range requests (popular topics asked for more
+often) from several client threads, in three phases:
+
+    cold         first request of every URL (LRU misses)
+    warm         the same URLs again (LRU hits)
+    conditional  warm, with If-None-Match (empty 304 answers)
+
+Then one more day is committed and the first request after it (which
+reloads the stores) is timed, and checked to see the new day.
+"""
+import argparse
+import http.client
+import multiprocessing
+import random
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+from agents.topic_counter import TopicCounterAgent
+from agents.topic_deduplicator import TopicDeduplicatorAgent
+from orchestrator.query_service import QueryServer, QueryService
+from stores.topic_registry import TopicRegistry
+from benchmarks.results import write_results
+from benchmarks.workspace import workspace
+from config import WINDOW_DAYS
+
+# p95 latency targets (milliseconds) per phase over local HTTP, with
+# the default 8 clients in flight (queueing included)
+TARGET_P95_MS = {"cold": 50.0, "warm": 10.0, "conditional": 10.0}
+
+END = date(2024, 10, 30)
+START_DATE = END - timedelta(days=WINDOW_DAYS - 1)
+SEED = 5
+
+
+def fill_run(topics: int) -> Tuple[TopicCounterAgent, TopicRegistry, np.ndarray]:
+    """Commits WINDOW_DAYS days for topics synthetic topics."""
+    registry = TopicRegistry()
+    for i in range(topics):
+        registry.add(f"Synthetic topic {i}", START_DATE.isoformat())
+    registry.commit()
+
+    counter = TopicCounterAgent(deduplicator=TopicDeduplicatorAgent(registry=registry))
+    rng = np.random.default_rng(SEED)
+    levels = rng.gamma(1.0, 5.0, size=topics)
+    for offset in range(WINDOW_DAYS - 1, -1, -1):
+        commit_day(counter, registry, levels, rng, END - timedelta(days=offset))
+    return counter, registry, levels
+
+
+def commit_day(counter, registry, levels, rng, day: date):
+    counts = rng.poisson(levels)
+    counter.commit(
+        candidate_counts=dict(zip(registry.names, counts.tolist())),
+        topics=registry,
+        date=day.isoformat()
+    )
+
+
+def request_mix(topics: int, count: int) -> List[str]:
+    """count distinct dashboard URLs, popular topics first."""
+    rng = random.Random(SEED)
+    days = [(END - timedelta(days=offset)).isoformat() for offset in range(WINDOW_DAYS)]
+
+    urls = set()
+    while len(urls) < count:
+        kind = rng.random()
+        # Zipf-like popularity over topic ids
+        topic_id = min(int(rng.paretovariate(1.2)) - 1, topics - 1)
+        if kind < 0.6:
+            granularity = rng.choice(["day", "day", "week", "month"])
+            start = rng.choice(days)
+            urls.add(f"/series?id={topic_id}&granularity={granularity}&start={start}")
+        elif kind < 0.8:
+            n = rng.choice([10, 25, 100])
+            rank_by = rng.choice(["total", "recent"])
+            urls.add(f"/top?n={n}&rank_by={rank_by}&start={rng.choice(days)}")
+        else:
+            names = "&".join(
+                "topic=" + quote(f"Synthetic topic {rng.randrange(topics)}") for _ in range(5)
+            )
+            urls.add(f"/range?start={rng.choice(days)}&{names}")
+    return sorted(urls)
+
+
+def fetch(
+    connection: http.client.HTTPConnection,
+    url: str,
+    etag: Optional[str] = None
+) -> Tuple[int, str, bytes, float]:
+    headers = {"If-None-Match": etag} if etag else {}
+    started = time.perf_counter()
+    connection.request("GET", url, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    return response.status, response.getheader("ETag"), body, time.perf_counter() - started
+
+
+def run_phase(port: int, urls: List[str], clients: int, etags: Dict[str, str] = None) -> dict:
+    """Requests every url once, spread over client threads."""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+
+    def client(share: List[str]):
+        # One keep-alive connection per client, like a polling dashboard
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        for url in share:
+            status, etag, _, seconds = fetch(connection, url, etags.get(url) if etags else None)
+            with lock:
+                latencies.append(seconds)
+                statuses[status] = statuses.get(status, 0) + 1
+                if etags is None:
+                    collected[url] = etag
+        connection.close()
+
+    collected: Dict[str, str] = {}
+    threads = [threading.Thread(target=client, args=(urls[i::clients],)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(urls),
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+        "requests_per_second": round(len(urls) / seconds, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "etags": collected,
+    }
+
+
+def serve_child(ready):
+    server = QueryServer(QueryService(), "127.0.0.1", 0)
+    ready.send(server.server_address[1])
+    server.serve_forever()
+
+
+def measure(topics: int, clients: int, requests: int) -> dict:
+    with workspace():
+        counter, registry, levels = fill_run(topics)
+
+        # The server gets its own interpreter, as with main.py --serve,
+        # so client threads do not compete with it for the GIL
+        ready, child_end = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=serve_child, args=(child_end,), daemon=True)
+        server.start()
+        port = ready.recv()
+
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        try:
+            # First request loads the stores into memory
+            _, _, _, load_seconds = fetch(connection, "/version")
+
+            urls = request_mix(topics, requests)
+            phases = {"cold": run_phase(port, urls, clients)}
+            etags = phases["cold"]["etags"]
+            phases["warm"] = run_phase(port, urls, clients)
+            phases["conditional"] = run_phase(port, urls, clients, etags)
+            assert phases["conditional"]["statuses"] == {"304": len(urls)}
+
+            # A committed day drops the cache: new data, new ETag
+            _, top_etag, _, _ = fetch(connection, "/top?n=10")
+            next_day = END + timedelta(days=1)
+            commit_day(counter, registry, levels, np.random.default_rng(SEED + 1), next_day)
+            status, new_etag, body, reload_seconds = fetch(connection, "/top?n=10", top_etag)
+            assert status == 200 and new_etag != top_etag
+            assert next_day.isoformat().encode() in body
+        finally:
+            connection.close()
+            server.terminate()
+            server.join()
+
+    result = {
+        "topics": topics,
+        "clients": clients,
+        "load_ms": round(load_seconds * 1000, 2),
+        "reload_after_commit_ms": round(reload_seconds * 1000, 2),
+    }
+    for phase, stats in phases.items():
+        stats.pop("etags")
+        stats["target_p95_ms"] = TARGET_P95_MS[phase]
+        stats["meets_target"] = stats["p95_ms"] <= TARGET_P95_MS[phase]
+        result[phase] = stats
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query service load test")
+    parser.add_argument("--topics", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument(
+        "--requests", type=int, default=400,
+        help="Distinct URLs per phase (more than QUERY_CACHE_SIZE makes warm requests miss)"
+    )
+    args = parser.parse_args()
+
+    results = []
+    for topics in args.topics:
+        result = measure(topics, args.clients, args.requests)
+        print(
+            f"{topics:>7} topics: load {result['load_ms']}ms, "
+            f"reload after commit {result['reload_after_commit_ms']}ms"
+        )
+        for phase in TARGET_P95_MS:
+            stats = result[phase]
+            print(
+                f"    {phase:<12} p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, "
+                f"p99 {stats['p99_ms']}ms, {stats['requests_per_second']} req/s "
+                f"(target p95 {stats['target_p95_ms']}ms: "
+                f"{'met' if stats['meets_target'] else 'MISSED'})"
+            )
+        results.append(result)
+
+    print("Results written to", write_results("query_service", results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: SpikeDetectorAgent over a synthetic trend matrix vs. a
+per-topic Python loop computing the same statistics.
+
+    python -m benchmarks.spike_detector
+    python -m benchmarks.spike_detector --topics 1000 10000 50000
+
+Each run fills a MatrixTrendStore with WINDOW_DAYS days of Poisson
+counts and a few injected spikes on the last day, then times one
+detector run for that day.
+"""
+import argparse
+import math
+import statistics
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from agents.spike_detector import SpikeDetectorAgent
+from stores.trend_store import MatrixTrendStore
+from benchmarks.results import write_results
+from benchmarks.workspace import workspace
+from config import WINDOW_DAYS
+
+END = date(2024, 10, 30)
+SPIKE_RATE = 0.001
+SEED = 7
+
+
+def fill_store(store: MatrixTrendStore, topics: int) -> list:
+    rng = np.random.default_rng(SEED)
+    names = [f"topic {i}" for i in range(topics)]
+    levels = rng.gamma(2.0, 5.0, size=topics)
+
+    for offset in range(WINDOW_DAYS - 1, -1, -1):
+        counts = rng.poisson(levels)
+        if offset == 0:
+            spiking = rng.random(topics) < SPIKE_RATE
+            counts[spiking] += rng.poisson(levels[spiking] * 4 + 10)
+        day = (END - timedelta(days=offset)).isoformat()
+        store.record_day(day, dict(zip(names, counts.tolist())))
+
+    return names
+
+
+def loop_detect(detector: SpikeDetectorAgent, store: MatrixTrendStore, day: str) -> list:
+    """Reference: the same scores, one topic at a time."""
+    dates = [
+        (END - timedelta(days=offset)).isoformat()
+        for offset in range(detector.baseline_days, -1, -1)
+    ]
+    window = store.window(dates)
+    alpha = detector.ewma_alpha
+
+    alerts = []
+    for topic, date_counts in window.items():
+        history = [date_counts[d] for d in dates[:-1]]
+        today = date_counts[day]
+
+        mean = statistics.fmean(history)
+        std = max(statistics.pstdev(history), 1.0)
+        zscore = (today - mean) / std
+
+        ewma = history[0]
+        for value in history[1:]:
+            ewma = alpha * value + (1 - alpha) * ewma
+
+        if zscore >= detector.z_threshold and today >= detector.min_count:
+            alerts.append((topic, zscore, ewma))
+
+    alerts.sort(key=lambda alert: -alert[1])
+    return alerts
+
+
+def measure(topics: int, loop: bool) -> dict:
+    with workspace():
+        store = MatrixTrendStore("matrix", "trends.json")
+        fill_store(store, topics)
+        detector = SpikeDetectorAgent(trend_store=store, output_dir="output")
+        day = END.isoformat()
+
+        started = time.perf_counter()
+        alerts = detector.run(date=day)
+        seconds = time.perf_counter() - started
+
+        result = {
+            "topics": topics,
+            "days": WINDOW_DAYS,
+            "alerts": len(alerts),
+            "vectorized_seconds": round(seconds, 4),
+        }
+
+        if loop:
+            started = time.perf_counter()
+            expected = loop_detect(detector, store, day)
+            result["loop_seconds"] = round(time.perf_counter() - started, 4)
+            result["speedup"] = round(result["loop_seconds"] / seconds, 1)
+
+            # Same alerts and scores; order may differ between exact ties
+            found = {a["topic"]: (a["zscore"], a["ewma"]) for a in alerts}
+            assert found.keys() == {topic for topic, _, _ in expected}
+            assert all(
+                math.isclose(found[topic][0], zscore, abs_tol=1e-3)
+                and math.isclose(found[topic][1], ewma, abs_tol=1e-3)
+                for topic, zscore, ewma in expected
+            )
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spike detection benchmark")
+    parser.add_argument("--topics", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--no-loop", action="store_true", help="Skip the per-topic baseline")
+    args = parser.parse_args()
+
+    results = []
+    for topics in args.topics:
+        result = measure(topics, loop=not args.no_loop)
+        line = f"{topics:>7} topics: {result['vectorized_seconds']}s, {result['alerts']} alerts"
+        if "loop_seconds" in result:
+            line += f" (loop {result['loop_seconds']}s, {result['speedup']}x)"
+        print(line)
+        results.append(result)
+
+    print("Results written to", write_results("spike_detector", results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Seeded synthetic Google Play reviews whose vocabulary follows
+seed_topics.json and keyword_topics.json.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import List, Dict
+
+from agents.taxonomy import Taxonomy, load_taxonomy
+
+FILLER = [
+    "the", "app", "order", "today", "was", "very", "again", "my", "i",
+    "this", "time", "every", "they", "never", "really", "good", "nice",
+    "great", "food", "restaurant", "ordered", "please", "fix", "worst",
+    "love", "using", "since", "last", "week", "experience", "service"
+]
+NOISE = ["!", "!!", "...", "?", " :(", " 👍", ",", " #fail", " 10/10"]
+
+
+class SyntheticReviewGenerator:
+    """
+    Reviews are generated in deterministic batches: the same
+    (seed, offset, count) always yields the same reviews, so pages can
+    be produced lazily without holding the corpus in memory.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        topic_rate: float = 0.7,
+        duplicate_rate: float = 0.02
+    ):
+        self.seed = seed
+        self.topic_rate = topic_rate
+        self.duplicate_rate = duplicate_rate
+        self.phrases = self._topic_phrases(load_taxonomy())
+
+    def batch(
+        self,
+        offset: int,
+        count: int,
+        newest: datetime = datetime(2024, 10, 31, 23, 59),
+        spacing: timedelta = timedelta(minutes=1)
+    ) -> List[Dict]:
+        """
+        Reviews offset .. offset+count-1 in google_play_scraper's
+        format, newest first: review i is `i * spacing` older than
+        `newest`.
+        """
+        rng = random.Random(f"{self.seed}:{offset}")
+        reviews = []
+
+        for i in range(offset, offset + count):
+            if reviews and rng.random() < self.duplicate_rate:
+                text = reviews[-1]["content"]
+            else:
+                text = self._text(rng)
+
+            reviews.append({
+                "reviewId": f"synthetic-{self.seed}-{i}",
+                "content": text,
+                "score": rng.randint(1, 5),
+                "at": newest - i * spacing,
+            })
+
+        return reviews
+
+    def cleaner_input(self, count: int) -> List[Dict]:
+        """Same reviews in the {"text", "rating"} shape the ingestor emits."""
+        return [
+            {"text": r["content"], "rating": r["score"]}
+            for r in self.batch(0, count)
+        ]
+
+    # ---------- helpers ----------
+
+    def _text(self, rng: random.Random) -> str:
+        words = rng.choices(FILLER, k=rng.randint(3, 12))
+
+        if rng.random() < self.topic_rate:
+            phrase = rng.choice(self.phrases)
+            words.insert(rng.randint(0, len(words)), phrase)
+
+        text = " ".join(words)
+        if rng.random() < 0.3:
+            text = text.capitalize()
+        if rng.random() < 0.1:
+            text = text.upper()
+        return text + rng.choice(NOISE)
+
+    @staticmethod
+    def _topic_phrases(taxonomy: Taxonomy) -> List[str]:
+        phrases = [topic.lower() for topic in taxonomy.seed_topics]
+
+        for _, primary_keys, secondary_keys in taxonomy.keyword_topics:
+            for primary in primary_keys:
+                if not secondary_keys:
+                    phrases.append(primary)
+                for secondary in secondary_keys:
+                    phrases.append(f"{primary} {secondary}")
+                    phrases.append(f"{secondary} {primary}")
+
+        return phrases
@@ -0,0 +1,101 @@
+"""
+Micro-benchmark: compiled KeywordMatcher vs. the per-topic `in` loops
+TopicDiscoveryAgent used before it.
+
+    python -m benchmarks.topic_matcher
+"""
+import random
+import string
+import time
+from typing import List, Optional
+
+from agents.keyword_matcher import KeywordMatcher
+from benchmarks.results import write_results
+
+TOPIC_COUNTS = [10, 100, 1000]
+REVIEW_COUNT = 2000
+WORDS_PER_REVIEW = 20
+SEED = 42
+
+
+def loop_match(rules, text: str) -> Optional[str]:
+    """
+    Reference implementation: the old _match_seed_topic /
+    _match_keyword_topic loops, lower-casing the text per rule list.
+    """
+    text_lower = text.lower()
+    for topic, primary_keys, secondary_keys in rules:
+        if any(p in text_lower for p in primary_keys):
+            if not secondary_keys or any(s in text_lower for s in secondary_keys):
+                return topic
+    return None
+
+
+def make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    return [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+        for _ in range(size)
+    ]
+
+
+def make_rules(rng: random.Random, vocabulary: List[str], count: int):
+    rules = []
+    for i in range(count):
+        primary = rng.sample(vocabulary, rng.randint(1, 4))
+        secondary = rng.sample(vocabulary, rng.choice([0, 0, 2, 3]))
+        rules.append((f"topic {i}", primary, secondary))
+    return rules
+
+
+def make_reviews(rng: random.Random, vocabulary: List[str]) -> List[str]:
+    return [
+        " ".join(rng.choice(vocabulary) for _ in range(WORDS_PER_REVIEW))
+        for _ in range(REVIEW_COUNT)
+    ]
+
+
+def time_it(fn, reviews) -> float:
+    start = time.perf_counter()
+    for text in reviews:
+        fn(text)
+    return time.perf_counter() - start
+
+
+def run():
+    rng = random.Random(SEED)
+    vocabulary = make_vocabulary(rng, 5000)
+    reviews = make_reviews(rng, vocabulary)
+
+    results = []
+    for count in TOPIC_COUNTS:
+        rules = make_rules(rng, vocabulary, count)
+        matcher = KeywordMatcher(rules)
+
+        for text in reviews:
+            assert matcher.match(text) == loop_match(rules, text), text
+
+        loop_seconds = time_it(lambda t: loop_match(rules, t), reviews)
+        matcher_seconds = time_it(matcher.match, reviews)
+
+        results.append({
+            "topics": count,
+            "reviews": REVIEW_COUNT,
+            "loop_seconds": round(loop_seconds, 4),
+            "matcher_seconds": round(matcher_seconds, 4),
+            "speedup": round(loop_seconds / matcher_seconds, 2)
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print(f"{'topics':>8} {'loop (s)':>10} {'matcher (s)':>12} {'speedup':>8}")
+    for row in results:
+        print(
+            f"{row['topics']:>8} {row['loop_seconds']:>10} "
+            f"{row['matcher_seconds']:>12} {row['speedup']:>8}"
+        )
+
+    print("Results written to", write_results("topic_matcher", results))
@@ -0,0 +1,195 @@
+"""
+Benchmark: TopicDeduplicatorAgent on the journaled TopicRegistry vs.
+rewriting the whole topic store (JSON, indent=2) every day, plus the
+size of the SQLite trend store keyed by topic id vs. by topic name.
+
+    python -m benchmarks.topic_registry
+    python -m benchmarks.topic_registry --topics 1000 20000 --days 30
+
+Each run starts from a store of that many topics with two aliases
+each. Every day most candidates are existing names or aliases, a few
+are new aliases (an existing name with one word upper-cased) and a
+few are new topics; matched topics get the day's last_updated, as in
+a daily scheduled run.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from agents.topic_deduplicator import TopicDeduplicatorAgent
+from stores.atomic import atomic_write
+from stores.topic_registry import TopicRegistry
+from stores.trend_store import SqliteTrendStore
+from benchmarks.results import write_results
+from benchmarks.workspace import workspace
+
+START = date(2024, 10, 1)
+CANDIDATES_PER_DAY = 200
+NEW_ALIASES_PER_DAY = 10
+NEW_TOPICS_PER_DAY = 5
+SEED = 11
+
+
+def initial_store(topics: int) -> Dict[str, Dict]:
+    return {
+        f"Synthetic topic {i} about delivery and refunds": {
+            "aliases": [f"synthetic topic {i} alias a", f"synthetic topic {i} alias b"],
+            "created_on": START.isoformat(),
+            "last_updated": START.isoformat()
+        }
+        for i in range(topics)
+    }
+
+
+def daily_candidates(store: Dict[str, Dict], days: int) -> List[List[str]]:
+    rng = random.Random(SEED)
+    names = list(store)
+    schedule = []
+    for day in range(days):
+        candidates = [rng.choice(names) for _ in range(CANDIDATES_PER_DAY)]
+        for _ in range(NEW_ALIASES_PER_DAY):
+            words = rng.choice(names).split()
+            position = rng.randrange(len(words))
+            words[position] = words[position].upper()
+            candidates.append(" ".join(words))
+        candidates += [f"New topic {day}-{i}" for i in range(NEW_TOPICS_PER_DAY)]
+        schedule.append(candidates)
+    return schedule
+
+
+def rewrite_day(store: Dict[str, Dict], index: Dict[str, str], candidates: List[str], day: str, path: str):
+    """Reference: the former per-day merge and full-store rewrite."""
+    for candidate in candidates:
+        key = " ".join(candidate.lower().split())
+        matched = index.get(key)
+        if matched is None:
+            store[candidate] = {"aliases": [], "created_on": day, "last_updated": day}
+            index.setdefault(key, candidate)
+        else:
+            if candidate not in store[matched]["aliases"]:
+                store[matched]["aliases"].append(candidate)
+            store[matched]["last_updated"] = day
+
+    with atomic_write(path) as f:
+        json.dump(store, f, indent=2)
+
+
+def directory_bytes(paths: List[str]) -> int:
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+
+def measure_registry(topics: int, days: int) -> dict:
+    store = initial_store(topics)
+    schedule = daily_candidates(store, days)
+    dates = [(START + timedelta(days=d)).isoformat() for d in range(days)]
+
+    with workspace():
+        with open("topics.json", "w") as f:
+            json.dump(store, f)
+
+        started = time.perf_counter()
+        agent = TopicDeduplicatorAgent(registry=TopicRegistry("topics.json", "topics.journal"))
+        load_seconds = time.perf_counter() - started
+        agent._seeded = True
+
+        written = 0
+        started = time.perf_counter()
+        for day, candidates in zip(dates, schedule):
+            agent._today = lambda day=day: day
+            before = directory_bytes(["topics.journal"])
+            snapshot = os.stat("topics.json").st_ino
+            agent.run(candidate_topics=[{"topic": topic} for topic in candidates])
+            after = directory_bytes(["topics.journal"])
+            if os.stat("topics.json").st_ino != snapshot:
+                written += os.path.getsize("topics.json")
+            else:
+                written += after - before
+        journal_seconds = time.perf_counter() - started
+
+    with workspace():
+        index = {}
+        for name, data in store.items():
+            index.setdefault(" ".join(name.lower().split()), name)
+            for alias in data["aliases"]:
+                index.setdefault(" ".join(alias.lower().split()), name)
+
+        rewritten = 0
+        started = time.perf_counter()
+        for day, candidates in zip(dates, schedule):
+            rewrite_day(store, index, candidates, day, "topics.json")
+            rewritten += os.path.getsize("topics.json")
+        rewrite_seconds = time.perf_counter() - started
+
+    return {
+        "topics": topics,
+        "days": days,
+        "load_seconds": round(load_seconds, 4),
+        "journal_seconds_per_day": round(journal_seconds / days, 5),
+        "rewrite_seconds_per_day": round(rewrite_seconds / days, 5),
+        "speedup": round(rewrite_seconds / journal_seconds, 1),
+        "journal_bytes_per_day": written // days,
+        "rewrite_bytes_per_day": rewritten // days,
+    }
+
+
+def measure_trend_db(topics: int, days: int) -> dict:
+    """Bytes of the SQLite trend store keyed by id vs. by topic name."""
+    names = list(initial_store(topics))
+    dates = [(START + timedelta(days=d)).isoformat() for d in range(days)]
+
+    with workspace():
+        store = SqliteTrendStore("ids.db")
+        for d in dates:
+            store.record_day(d, dict.fromkeys(names, 1))
+        store.flush()
+        store.conn.execute("VACUUM")
+
+        conn = sqlite3.connect("names.db")
+        conn.execute(
+            "CREATE TABLE trends (topic TEXT NOT NULL, date TEXT NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (topic, date)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX trends_by_date ON trends (date)")
+        conn.executemany(
+            "INSERT INTO trends VALUES (?, ?, 1)", ((name, d) for d in dates for name in names)
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+
+        return {
+            "trend_db_bytes": os.path.getsize("ids.db"),
+            "named_trend_db_bytes": os.path.getsize("names.db"),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Topic registry benchmark")
+    parser.add_argument("--topics", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    results = []
+    for topics in args.topics:
+        result = measure_registry(topics, args.days)
+        result.update(measure_trend_db(topics, args.days))
+        print(
+            f"{topics:>7} topics: {result['journal_seconds_per_day']}s/day, "
+            f"{result['journal_bytes_per_day']} bytes/day "
+            f"(rewrite {result['rewrite_seconds_per_day']}s/day, "
+            f"{result['rewrite_bytes_per_day']} bytes/day, {result['speedup']}x); "
+            f"trend db {result['trend_db_bytes']} bytes "
+            f"(by name {result['named_trend_db_bytes']})"
+        )
+        results.append(result)
+
+    print("Results written to", write_results("topic_registry", results))
+
+
+if __name__ == "__main__":
+    main()
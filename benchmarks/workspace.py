@@ -0,0 +1,30 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TAXONOMY_FILES = [
+    os.path.join("storage", "topic_store", "seed_topics.json"),
+    os.path.join("storage", "topic_store", "keyword_topics.json"),
+]
+
+
+@contextmanager
+def workspace():
+    """
+    Runs the body inside a throw-away working directory holding only
+    the seed and keyword topics, so benchmarks never touch the real storage/ and
+    output/ directories (all store paths are relative to the cwd).
+    """
+    previous = os.getcwd()
+    root = tempfile.mkdtemp(prefix="bench-")
+    try:
+        for name in TAXONOMY_FILES:
+            os.makedirs(os.path.join(root, os.path.dirname(name)), exist_ok=True)
+            shutil.copy(os.path.join(REPO_ROOT, name), os.path.join(root, name))
+        os.chdir(root)
+        yield root
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(root, ignore_errors=True)
@@ -10,6 +10,7 @@ APPS = {
 }
 
 
+# Days kept and reported (e.g. 30, 90, 180 or 365); the only window setting
 WINDOW_DAYS = 30
 OUTPUT_DIR = "output"
 
@@ -17,12 +18,114 @@ OUTPUT_DIR = "output"
 # Storage paths
 RAW_REVIEW_PATH = "storage/raw_reviews/"
 TOPIC_STORE_PATH = "storage/topic_store/topics.json"
+TOPIC_JOURNAL_PATH = "storage/topic_store/topics.journal"
+SEED_TOPICS_PATH = "storage/topic_store/seed_topics.json"
+KEYWORD_TOPICS_PATH = "storage/topic_store/keyword_topics.json"
 TREND_STORE_PATH = "storage/trend_store/trends.json"
+TREND_DB_PATH = "storage/trend_store/trends.db"
+TREND_MATRIX_DIR = "storage/trend_store/matrix"
+TREND_ROLLUP_PATH = "storage/trend_store/rollups.json"
+TREND_VERSION_PATH = "storage/trend_store/version.json"
+SEEN_REVIEWS_PATH = "storage/review_store/seen_reviews"
+EVIDENCE_PATH = "storage/topic_store/evidence.json"
+
+# Seed + keyword topics compiled into one matcher; rebuilt only when
+# either source file (or the compiled format) changes
+TAXONOMY_CACHE_PATH = "storage/topic_store/taxonomy.pickle"
+
+# Topic registry: changes are appended to TOPIC_JOURNAL_PATH and folded
+# into the TOPIC_STORE_PATH snapshot once the journal holds this many
+TOPIC_JOURNAL_COMPACT_ENTRIES = 1000
+
+# Completed days of the current run and the store checkpoint for --resume
+RUN_MANIFEST_PATH = "storage/run_manifest.json"
+CHECKPOINT_DIR = "storage/checkpoint"
+
+# Example reviews kept per topic (reservoir sample over all matches)
+EVIDENCE_SAMPLE_SIZE = 5
+
+# Batch runs give every app its own namespace under these roots
+# (storage/apps/<app_id>/..., output/<app_id>/); see stores/paths.py
+APP_STORAGE_ROOT = "storage/apps"
+
+# "matrix" (dense topics x WINDOW_DAYS ring buffer in .npy files, default),
+# "sqlite" (indexed table, keeps per-day history) or "json" (original
+# trends.json layout)
+TREND_STORE_BACKEND = "matrix"
+
+# Topic deduplication: besides exact (normalized) name / alias hits,
+# optionally merge near-duplicate names via a MinHash-LSH index over
+# character trigrams (Jaccard similarity >= threshold)
+DEDUP_FUZZY_MATCHING = False
+DEDUP_FUZZY_THRESHOLD = 0.5
+
+# Near-duplicate filter (NearDuplicateFilterAgent, between cleaning and
+# discovery): a review of at least NEAR_DUPLICATE_MIN_TOKENS words is
+# dropped when the Jaccard similarity of its words and word pairs with an
+# earlier review of the same day, estimated by MinHash, is at least
+# NEAR_DUPLICATE_THRESHOLD (copy-pasted or templated review bursts).
+# Candidates come from NEAR_DUPLICATE_BANDS bands of NEAR_DUPLICATE_ROWS
+# signature positions each
+NEAR_DUPLICATE_THRESHOLD = 0.6
+NEAR_DUPLICATE_MIN_TOKENS = 5
+NEAR_DUPLICATE_BANDS = 16
+NEAR_DUPLICATE_ROWS = 4
 
 # Output paths
 OUTPUT_DIR = "output"
 CSV_REPORT_NAME = "trend_report.csv"
 JSON_REPORT_NAME = "trend_report.json"
+ALERTS_REPORT_NAME = "trend_alerts.json"
+NEAR_DUPLICATES_REPORT_NAME = "near_duplicates.json"
+
+# When reports are written:
+#   "final"       - once, after the last day of the run
+#   "daily"       - full rebuild after every day
+#   "incremental" - after every day, refreshing only changed topics
+REPORT_MODE = "final"
+
+# Report columns: "day", or "week" / "month" read from the pre-aggregated
+# rollups (keeps 90-365 day windows to a few dozen columns)
+REPORT_GRANULARITY = "day"
+
+# HTML dashboard: number of topics shown (0 = all), ranked by "total"
+# volume over the report or by "recent" volume (last 7 days / latest column)
+REPORT_TOP_K = 100
+REPORT_RANK_BY = "total"
+
+# Spike detection (SpikeDetectorAgent, after counting): a topic is flagged
+# when its count today is at least SPIKE_MIN_COUNT and SPIKE_Z_THRESHOLD
+# standard deviations above its mean over the previous SPIKE_BASELINE_DAYS
+# (which need SPIKE_MIN_HISTORY days with data)
+SPIKE_BASELINE_DAYS = 14
+SPIKE_Z_THRESHOLD = 3.0
+SPIKE_MIN_COUNT = 5
+SPIKE_MIN_HISTORY = 3
+SPIKE_EWMA_ALPHA = 0.3
+
+# Ingestion pages NEWEST-first until it passes the start of the run's
+# range; this caps the number of pages read for one range
+INGEST_MAX_PAGES = 2000
+
+# DEBUG also logs every review and topic payload; INFO logs counts and timings
+LOG_LEVEL = "INFO"
+
+# Record per-agent wall/CPU time and peak memory to output/run_profile.*
+PROFILE_RUN = False
+
+# Batch runs (main.py --apps ...): ingestion threads, shared request
+# rate against the Play Store host, and processes for the CPU stages
+BATCH_CONCURRENCY = 4
+BATCH_REQUESTS_PER_SECOND = 2.0
+BATCH_PROCESSES = 1
+
+# Query service (python main.py --serve): read-only JSON over HTTP from
+# the stores held in memory, with an LRU of QUERY_CACHE_SIZE responses
+# that is dropped whenever a day is committed
+QUERY_HOST = "127.0.0.1"
+QUERY_PORT = 8765
+QUERY_CACHE_SIZE = 512
+QUERY_TOP_N = 10
 
 # LLM config (future use)
 LLM_PROVIDER = "openai"
@@ -1,26 +1,22 @@
 from datetime import datetime, timedelta
+import argparse
+import logging
 import os
-import json
 import webbrowser
 
-from config import APPS, WINDOW_DAYS, OUTPUT_DIR
+from config import (
+    APPS, WINDOW_DAYS, OUTPUT_DIR, PROFILE_RUN, LOG_LEVEL, REPORT_GRANULARITY,
+    BATCH_CONCURRENCY, BATCH_PROCESSES, BATCH_REQUESTS_PER_SECOND, QUERY_HOST, QUERY_PORT
+)
+from agents.profiler import PROFILER
 from orchestrator.daily_controller import DailyController
+from orchestrator.batch_runner import run_batch, date_range
+from stores.paths import reset_storage
 
 
 # ---------------- RESET STATE ----------------
 def reset_state():
-    os.makedirs("storage/topic_store", exist_ok=True)
-    os.makedirs("storage/trend_store", exist_ok=True)
-    os.makedirs("storage/review_store", exist_ok=True)
-
-    with open("storage/topic_store/topics.json", "w") as f:
-        json.dump({}, f)
-
-    with open("storage/trend_store/trends.json", "w") as f:
-        json.dump({}, f)
-
-    with open("storage/review_store/seen_reviews.json", "w") as f:
-        json.dump([], f)
+    reset_storage()
 
 
 # ---------------- USER INPUT ----------------
@@ -44,33 +40,154 @@ def get_start_date():
     return datetime.strptime(date_str, "%Y-%m-%d").date()
 
 
-# ---------------- MAIN ----------------
-if __name__ == "__main__":
-    reset_state()
+def parse_args():
+    parser = argparse.ArgumentParser(description="App review trend analysis")
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Run from storage/raw_reviews/ without any network calls"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the interrupted run from storage/run_manifest.json, skipping finished days"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=PROFILE_RUN,
+        help="Write per-agent timings to output/run_profile.json and .csv"
+    )
+    parser.add_argument(
+        "--log-level",
+        default=LOG_LEVEL,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="DEBUG also logs every review and topic payload"
+    )
+    parser.add_argument(
+        "--granularity",
+        default=REPORT_GRANULARITY,
+        choices=["day", "week", "month"],
+        help="Report columns; week and month read the pre-aggregated rollups"
+    )
 
-    app_key = get_app_choice()
-    start_date = get_start_date()
+    # Non-interactive batch mode
+    parser.add_argument(
+        "--apps",
+        nargs="+",
+        help="App keys from config.APPS or Play Store app ids; runs in batch mode"
+    )
+    parser.add_argument("--start", help="Batch start date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--end",
+        help="Batch end date (YYYY-MM-DD), defaults to start + WINDOW_DAYS - 1"
+    )
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=BATCH_REQUESTS_PER_SECOND
+    )
+    parser.add_argument("--processes", type=int, default=BATCH_PROCESSES)
 
-    app_id = APPS[app_key]["app_id"]
+    # Read-only query service over the stores of a finished or running run
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve trend and topic queries over HTTP instead of running the pipeline"
+    )
+    parser.add_argument("--host", default=QUERY_HOST)
+    parser.add_argument("--port", type=int, default=QUERY_PORT)
+    parser.add_argument(
+        "--namespace",
+        help="With --serve: app id of a batch run to serve (default: the interactive run)"
+    )
+    return parser.parse_args()
 
-    end_date = start_date + timedelta(days=WINDOW_DAYS - 1)
 
-    controller = DailyController()
+def run_batch_mode(args):
+    if not args.start:
+        raise ValueError("--start is required with --apps")
+
+    start_date = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end_date = (
+        datetime.strptime(args.end, "%Y-%m-%d").date()
+        if args.end else start_date + timedelta(days=WINDOW_DAYS - 1)
+    )
+
+    run_batch(
+        apps=args.apps,
+        start=start_date,
+        end=end_date,
+        concurrency=args.concurrency,
+        requests_per_second=args.requests_per_second,
+        processes=args.processes,
+        replay=args.replay,
+        granularity=args.granularity,
+        resume=args.resume
+    )
 
-    current_date = start_date
-    day_index = 0
 
-    while current_date <= end_date:
-        controller.run_for_date(
-            app_link=app_id,
-            date=current_date.isoformat(),
-            day_index=day_index
+def run_interactive(args):
+    if args.resume:
+        # Same app and dates as the interrupted run, stores kept
+        controller = DailyController(
+            replay=args.replay, granularity=args.granularity, resume=True
         )
+        if not controller.manifest.started:
+            raise ValueError("Nothing to resume: no run manifest in storage/")
 
-        current_date += timedelta(days=1)
-        day_index += 1
+        run = controller.manifest.data
+        app_id = run["app_id"]
+        start_date = datetime.strptime(run["start"], "%Y-%m-%d").date()
+        end_date = datetime.strptime(run["end"], "%Y-%m-%d").date()
+    else:
+        reset_state()
+
+        app_key = get_app_choice()
+        start_date = get_start_date()
+
+        app_id = APPS[app_key]["app_id"]
+
+        end_date = start_date + timedelta(days=WINDOW_DAYS - 1)
+
+        controller = DailyController(replay=args.replay, granularity=args.granularity)
+        controller.manifest.begin(app_id, start_date.isoformat(), end_date.isoformat())
+
+    controller.run_days(app_link=app_id, dates=date_range(start_date, end_date))
+
+    # Keep trends.json available for tools that read it directly
+    controller.trend_store.export_json()
+
+
+# ---------------- MAIN ----------------
+if __name__ == "__main__":
+    args = parse_args()
 
-    html_path = os.path.abspath(
-        os.path.join(OUTPUT_DIR, "trend_report.html")
+    logging.basicConfig(
+        level=args.log_level,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s"
     )
-    webbrowser.open(html_path)
+
+    if args.serve:
+        # Lazy: pipeline runs never load the HTTP server
+        from orchestrator.query_service import serve
+        serve(namespace=args.namespace, host=args.host, port=args.port)
+        raise SystemExit
+
+    if args.profile:
+        PROFILER.enable()
+
+    if args.apps:
+        run_batch_mode(args)
+    else:
+        run_interactive(args)
+
+    if args.profile:
+        PROFILER.write(OUTPUT_DIR)
+
+    if not args.apps:
+        html_path = os.path.abspath(
+            os.path.join(OUTPUT_DIR, "trend_report.html")
+        )
+        webbrowser.open(html_path)
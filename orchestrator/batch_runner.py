@@ -0,0 +1,165 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import List, Optional
+
+from agents.review_ingestor import ReviewIngestorAgent
+from orchestrator.daily_controller import DailyController
+from stores.paths import reset_storage
+from config import (
+    APPS, BATCH_CONCURRENCY, BATCH_PROCESSES, BATCH_REQUESTS_PER_SECOND,
+    REPORT_GRANULARITY
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Thread-safe minimum-interval limiter. Every app talks to the same
+    Play Store host, so one limiter is shared by all ingestion threads.
+    """
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def wrap(self, fetch):
+        def limited(*args, **kwargs):
+            self.wait()
+            return fetch(*args, **kwargs)
+        return limited
+
+
+def resolve_app_id(app: str) -> str:
+    """Accepts a config.APPS key ("swiggy") or a raw Play Store app id."""
+    return APPS[app]["app_id"] if app in APPS else app
+
+
+def date_range(start: date, end: date) -> List[str]:
+    return [
+        (start + timedelta(days=i)).isoformat()
+        for i in range((end - start).days + 1)
+    ]
+
+
+def run_batch(
+    apps: List[str],
+    start: date,
+    end: date,
+    concurrency: int = BATCH_CONCURRENCY,
+    requests_per_second: float = BATCH_REQUESTS_PER_SECOND,
+    processes: int = BATCH_PROCESSES,
+    replay: bool = False,
+    granularity: str = REPORT_GRANULARITY,
+    resume: bool = False
+) -> List[str]:
+    """
+    Non-interactive multi-app run over [start, end].
+
+    1. Ingestion (network-bound): every app's pages for the range are
+       fetched concurrently on a thread pool, behind one shared
+       per-host rate limit, into the raw review cache.
+    2. Processing (CPU-bound): each app's pipeline replays its cached
+       pages in its own storage namespace, on a process pool when
+       processes > 1.
+
+    With resume, pages already in the raw cache are not fetched again
+    and each app skips the days its run manifest marks as completed.
+
+    Returns the app ids processed.
+    """
+    app_ids = [resolve_app_id(app) for app in apps]
+    dates = date_range(start, end)
+
+    if not replay:
+        limiter = RateLimiter(requests_per_second)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(
+                lambda app_id: ingest_app(app_id, dates[0], dates[-1], limiter, resume),
+                app_ids
+            ))
+
+    if processes > 1:
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(logging.getLogger().level,)
+        ) as pool:
+            list(pool.map(
+                process_app, app_ids, [dates] * len(app_ids),
+                [granularity] * len(app_ids), [resume] * len(app_ids)
+            ))
+    else:
+        for app_id in app_ids:
+            process_app(app_id, dates, granularity, resume)
+
+    return app_ids
+
+
+def ingest_app(
+    app_id: str,
+    start: str,
+    end: str,
+    limiter: Optional[RateLimiter] = None,
+    resume: bool = False
+) -> int:
+    """
+    Pages newest-first into the raw review cache until the reviews
+    are older than start. With resume the pages already cached are
+    read back and only the ones after them are requested.
+    Returns the number of page requests sent.
+    """
+    ingestor = ReviewIngestorAgent()
+    if limiter is not None:
+        ingestor.fetch_reviews = limiter.wrap(ingestor.fetch_reviews)
+
+    if resume:
+        ingestor.resume_session(app_id)
+
+    ingestor.fetch_range(app_id, start, end)
+
+    logger.info("Ingested %s: %d pages", app_id, ingestor.pages_fetched)
+    return ingestor.pages_fetched
+
+
+def process_app(
+    app_id: str,
+    dates: List[str],
+    granularity: str = REPORT_GRANULARITY,
+    resume: bool = False
+):
+    """
+    Runs the CPU stages for one app from the raw review cache, in the
+    app's own storage namespace.
+    """
+    if not resume:
+        reset_storage(app_id)
+
+    controller = DailyController(
+        replay=True, namespace=app_id, granularity=granularity, resume=resume
+    )
+    if not controller.manifest.started:
+        controller.manifest.begin(app_id, dates[0], dates[-1])
+
+    controller.run_days(app_link=app_id, dates=dates)
+    controller.trend_store.export_json()
+    logger.info("Processed %s: %d days", app_id, len(dates))
+
+
+def _init_worker(log_level: int):
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s"
+    )
@@ -1,52 +1,260 @@
+import logging
+import time
+from datetime import date as date_cls, timedelta
+from typing import Dict, List, Optional, Iterable, Iterator
+
 from agents.review_ingestor import ReviewIngestorAgent
 from agents.cleaner_memory import CleanerMemoryAgent
+from agents.near_duplicate_filter import NearDuplicateFilterAgent
 from agents.topic_discovery import TopicDiscoveryAgent
 from agents.topic_deduplicator import TopicDeduplicatorAgent
 from agents.topic_counter import TopicCounterAgent
 from agents.report_generator import ReportGeneratorAgent
+from agents.spike_detector import SpikeDetectorAgent
+from stores.trend_store import open_trend_store
+from stores.seen_review_store import SeenReviewStore
+from stores.evidence_store import EvidenceStore
+from stores.rollup_store import RollupStore
+from stores.topic_registry import TopicRegistry
+from stores.trend_version import TrendVersion
+from stores.run_manifest import RunManifest
+from stores.paths import storage_paths
+from agents.profiler import PROFILER
+from config import REPORT_GRANULARITY, REPORT_MODE
+
+logger = logging.getLogger(__name__)
 
 
 class DailyController:
-    def __init__(self):
-        self.ingestor = ReviewIngestorAgent()
+    def __init__(
+        self,
+        replay: bool = False,
+        report_mode: str = REPORT_MODE,
+        namespace: Optional[str] = None,
+        granularity: str = REPORT_GRANULARITY,
+        resume: bool = False
+    ):
+        if report_mode not in ("final", "daily", "incremental"):
+            raise ValueError(f"Unknown report mode: {report_mode}")
+        self.report_mode = report_mode
+        self._reported_date = None
+
+        # Per-app stores when a namespace is given (batch runs)
+        self.paths = storage_paths(namespace)
+
+        # Completed days and checkpoints; when resuming, the small
+        # stores are put back before the agents load them. Otherwise
+        # nothing is written until the first day runs
+        self.manifest = RunManifest(self.paths["manifest"], self.paths["checkpoint"])
+        if resume:
+            self.manifest.restore_checkpoint(self._checkpoint_files())
+
+        self.ingestor = ReviewIngestorAgent(replay=replay)
         self.cleaner = CleanerMemoryAgent()
+        self.near_duplicates = NearDuplicateFilterAgent(self.paths["near_duplicates"])
+        self.evidence = EvidenceStore(self.paths["evidence"])
         self.discovery = TopicDiscoveryAgent()
-        self.deduplicator = TopicDeduplicatorAgent()
-        self.counter = TopicCounterAgent()
-        self.reporter = ReportGeneratorAgent()
 
-    def run_for_date(self, app_link: str, date: str, day_index: int):
-        print("[Controller] Starting pipeline")
+        # Canonical topics stay resident for the whole run; each day
+        # appends only its changes to the registry's journal
+        self.topics = TopicRegistry(self.paths["topic_store"], self.paths["topic_journal"])
+        self.deduplicator = TopicDeduplicatorAgent(registry=self.topics)
+
+        # One trend store shared by counting and reporting, so the
+        # report reads the day's counts without re-loading them
+        self.trend_store = open_trend_store(
+            json_path=self.paths["trend_json"],
+            db_path=self.paths["trend_db"],
+            matrix_dir=self.paths["trend_matrix"]
+        )
+        self.rollups = RollupStore(self.paths["trend_rollups"])
+        self.counter = TopicCounterAgent(
+            trend_store=self.trend_store,
+            seen_reviews=SeenReviewStore(self.paths["seen_reviews"]),
+            rollups=self.rollups,
+            version=TrendVersion(self.paths["trend_version"]),
+            evidence=self.evidence,
+            deduplicator=self.deduplicator
+        )
+        self.spike_detector = SpikeDetectorAgent(
+            trend_store=self.trend_store,
+            output_dir=self.paths["output_dir"]
+        )
+        self.reporter = ReportGeneratorAgent(
+            trend_store=self.trend_store,
+            output_dir=self.paths["output_dir"],
+            evidence=self.evidence,
+            rollups=self.rollups,
+            granularity=granularity
+        )
+
+        # What an interrupted day wrote is dropped when run_days starts
+        self._interrupted = resume and self.manifest.started
+
+    def run_days(self, app_link: str, dates: List[str]):
+        """
+        Runs every day of dates not already completed in the run
+        manifest, then renders the final report.
+        """
+        if self._interrupted:
+            self._discard_interrupted_day()
+            self._interrupted = False
+
+        for day_index, date in enumerate(dates):
+            if self.manifest.is_completed(date):
+                continue
+            self.run_for_date(
+                app_link=app_link,
+                date=date,
+                day_index=day_index,
+                start=dates[0],
+                end=dates[-1]
+            )
+
+        self.finish(target_date=dates[-1])
+
+    def run_for_date(
+        self,
+        app_link: str,
+        date: str,
+        day_index: int = 0,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ):
+        """
+        Runs the pipeline for one day. start/end is the whole run's
+        range: the first day's fetch pages back to start once and
+        buckets every review by its day for the days after it.
+        """
+        logger.info("Starting pipeline for %s", date)
+        PROFILER.current_date = date
+        started = time.perf_counter()
 
         raw_reviews = self.ingestor.run(
             app_id=app_link,
             date=date,
-            day_index=day_index
+            start=start,
+            end=end
         )
-        print("[Controller] Raw reviews:", raw_reviews)
 
-        cleaned_reviews = self.cleaner.run(
-            reviews=raw_reviews,
+        # clean -> filter -> discover -> count is one streaming chain:
+        # each review flows through every stage before the next one is
+        # read, and the counter checks seen hashes in bounded chunks
+        cleaned_reviews = self.cleaner.run_stream(
+            reviews=self._tap(raw_reviews, "Raw reviews"),
             date=date
         )
-        
-        print("[Controller] Cleaned reviews:", cleaned_reviews)
-
-        candidate_topics = self.discovery.run(
-            reviews=cleaned_reviews
+        distinct_reviews = self.near_duplicates.run_stream(
+            reviews=self._tap(cleaned_reviews, "Cleaned reviews"),
+            date=date
+        )
+        assignments = self.discovery.run_stream(
+            reviews=self._tap(distinct_reviews, "Distinct reviews")
+        )
+        candidate_counts = self.counter.count_stream(
+            assignments=self._tap(assignments, "Topic assignments"),
+            date=date
         )
-        print("[Controller] Candidate topics:", candidate_topics)
+        logger.info("Candidate topics: %d", len(candidate_counts))
+        logger.debug("Candidate topics: %s", candidate_counts)
 
         canonical_topics = self.deduplicator.run(
-            candidate_topics=candidate_topics
+            candidate_topics=[{"topic": topic} for topic in candidate_counts]
         )
-        print("[Controller] Canonical topics:", canonical_topics)
+        logger.info("Canonical topics: %d", len(canonical_topics))
+        logger.debug("Canonical topics: %s", canonical_topics)
 
-        self.counter.run(
-            reviews=cleaned_reviews,
+        # Example reviews follow their candidate into its canonical topic
+        for topic in candidate_counts:
+            self.evidence.merge(topic, self.deduplicator.resolve(topic) or topic)
+        self.evidence.save()
+
+        day_counts = self.counter.commit(
+            candidate_counts=candidate_counts,
             topics=canonical_topics,
             date=date
         )
+        logger.info("Counted reviews: %d", sum(day_counts.values()))
+
+        # Ranked spike alerts for the day, next to the trend report
+        self.spike_detector.run(date=date)
+
+        if self.report_mode == "daily":
+            self.generate_report(target_date=date)
+        elif self.report_mode == "incremental":
+            self.reporter.update(
+                target_date=date,
+                changed_topics=[t for t, count in day_counts.items() if count]
+            )
+            self._reported_date = date
+
+        # Checkpoint: only a day recorded here is skipped on resume
+        if self.manifest.started:
+            self.manifest.complete_day(
+                date=date,
+                day_index=day_index,
+                cursor=self.ingestor.cursor(),
+                files=self._checkpoint_files()
+            )
+
+        logger.info(
+            "Pipeline finished for %s in %.3fs",
+            date, time.perf_counter() - started
+        )
+
+    def _checkpoint_files(self) -> Dict[str, str]:
+        return {
+            name: self.paths[name]
+            for name in ("topic_store", "topic_journal", "evidence", "trend_rollups")
+        }
+
+    def _discard_interrupted_day(self):
+        """
+        Drops what an interrupted day wrote to the dated stores and
+        moves the ingestion cursor to where the last completed day
+        left it (where the interrupted fetch stopped, before any).
+        """
+        last = self.manifest.last_completed()
+        if last is None:
+            # The first day's whole-range fetch saved its cache session
+            # when it failed; continue it instead of paging afresh
+            first_pending = self.manifest.data["start"]
+            self.ingestor.resume_session(self.manifest.data["app_id"])
+        else:
+            first_pending = (date_cls.fromisoformat(last["date"]) + timedelta(days=1)).isoformat()
+            self.ingestor.restore_cursor(self.manifest.data["app_id"], last["cursor"])
+
+        self.trend_store.discard_from(first_pending)
+        self.trend_store.flush()
+        self.counter.seen_reviews.discard_from(first_pending)
+        self.counter.version.bump(last["date"] if last else None)
+        logger.info("Resuming %s from %s", self.manifest.data["app_id"], first_pending)
+
+    @staticmethod
+    def _tap(items: Iterable, label: str) -> Iterator:
+        """
+        Passes a stream through unchanged, logging each item at DEBUG
+        (formatted only when enabled) and the total at INFO.
+        """
+        count = 0
+        for item in items:
+            logger.debug("%s: %s", label, item)
+            count += 1
+            yield item
+        logger.info("%s: %d", label, count)
+
+    def generate_report(self, target_date: str):
+        """
+        Renders the JSON / CSV / HTML reports for the window ending
+        on target_date. Call once after the final day in "final" mode.
+        """
+        self.reporter.run(target_date=target_date)
+        self._reported_date = target_date
 
-        self.reporter.run(target_date=date)
-        print("[Controller] Pipeline finished")
+    def finish(self, target_date: str):
+        """
+        End of run: renders the report unless the last day already
+        produced an up-to-date one.
+        """
+        if self._reported_date != target_date:
+            self.generate_report(target_date=target_date)
@@ -0,0 +1,383 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date as date_cls, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from agents.report_generator import RECENT_DAYS
+from stores.paths import storage_paths
+from stores.rollup_store import GRANULARITIES, RollupStore
+from stores.topic_registry import TopicRegistry
+from stores.trend_store import open_trend_store
+from stores.trend_version import TrendVersion
+from config import (
+    QUERY_CACHE_SIZE, QUERY_HOST, QUERY_PORT, QUERY_TOP_N, TREND_STORE_BACKEND, WINDOW_DAYS
+)
+
+logger = logging.getLogger(__name__)
+
+Params = Dict[str, List[str]]
+
+
+class QueryError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class QueryService:
+    """
+    Read-only queries over one namespace's trend, rollup and topic
+    stores, for dashboards that poll:
+
+        GET /version                  latest committed day
+        GET /topics                   canonical topics with ids and aliases
+        GET /top?n=&rank_by=&start=&end=
+                                      top n topics by "total" or "recent" volume
+        GET /series?topic=|id=&start=&end=&granularity=
+                                      one topic's counts per day, week or month
+        GET /range?start=&end=&topic=...
+                                      counts of every (or the given) topic
+
+    The current window of daily counts is held in memory as one topics
+    x days matrix, next to the rollups and the topic registry. Encoded
+    responses are kept in an LRU of cache_size entries. Both are
+    reloaded once the trend version changes, i.e. after
+    TopicCounterAgent commits a day; checking it is one stat() per
+    request.
+    """
+
+    def __init__(
+        self,
+        namespace: Optional[str] = None,
+        backend: str = TREND_STORE_BACKEND,
+        cache_size: int = QUERY_CACHE_SIZE
+    ):
+        self.paths = storage_paths(namespace)
+        self.backend = backend
+        self.cache_size = cache_size
+        self.version = TrendVersion(self.paths["trend_version"])
+
+        # (path, params) -> (body, etag), least recently used first
+        self._cache: "OrderedDict[Tuple, Tuple[bytes, str]]" = OrderedDict()
+        self.hits = self.misses = 0
+
+        self._lock = threading.Lock()
+        self._loaded_version = None
+        self._routes = {
+            "/version": self._version,
+            "/topics": self._topics,
+            "/top": self._top,
+            "/series": self._series,
+            "/range": self._range,
+        }
+
+    def get(self, path: str, params: Params) -> Tuple[bytes, str]:
+        """
+        (JSON body, ETag) for a GET of path with parsed query params.
+        Raises QueryError for unknown paths and bad parameters.
+        """
+        route = self._routes.get(path.rstrip("/") or "/")
+        if route is None:
+            raise QueryError(404, f"Unknown path: {path}")
+
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        with self._lock:
+            self._refresh()
+
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+
+            self.misses += 1
+            body = json.dumps(route(params), separators=(",", ":")).encode("utf-8")
+            entry = (body, '"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest())
+
+            self._cache[key] = entry
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return entry
+
+    # ---------- helpers ----------
+
+    def _refresh(self):
+        version = self.version.current()
+        if version == self._loaded_version:
+            return
+
+        self.registry = TopicRegistry(self.paths["topic_store"], self.paths["topic_journal"])
+        self.rollups = RollupStore(self.paths["trend_rollups"])
+
+        # Stores written before the version marker existed have no
+        # date in it; their latest day is looked up once
+        latest = version["date"]
+        trend_store = None
+        if os.path.exists(self._trend_store_file()):
+            trend_store = open_trend_store(
+                backend=self.backend,
+                json_path=self.paths["trend_json"],
+                db_path=self.paths["trend_db"],
+                matrix_dir=self.paths["trend_matrix"],
+                mmap=True
+            )
+            if latest is None:
+                latest = max(
+                    (d for date_counts in trend_store.load().values() for d in date_counts),
+                    default=None
+                )
+
+        # The stores only keep the window, so it is all there is to hold
+        self.dates = _window_dates(latest) if latest else []
+        if trend_store is not None:
+            self.topic_names, self.counts = trend_store.matrix(self.dates)
+        else:
+            self.topic_names, self.counts = [], np.zeros((0, len(self.dates)), dtype=np.int64)
+        self.rows = {topic: row for row, topic in enumerate(self.topic_names)}
+
+        self._cache.clear()
+        self._loaded_version = version
+        logger.info(
+            "Query service loaded version %d: %d topics, %s",
+            version["version"], len(self.topic_names), latest
+        )
+
+    def _trend_store_file(self) -> str:
+        if self.backend == "matrix":
+            return os.path.join(self.paths["trend_matrix"], "counts.npy")
+        if self.backend == "sqlite":
+            return self.paths["trend_db"]
+        return self.paths["trend_json"]
+
+    def _version(self, params: Params) -> Dict:
+        return {
+            "version": self._loaded_version["version"],
+            "date": self.dates[-1] if self.dates else None,
+            "start": self.dates[0] if self.dates else None,
+            "topics": len(self.registry),
+        }
+
+    def _topics(self, params: Params) -> List[Dict]:
+        return [
+            {"id": topic_id, "topic": name, **self.registry.record(topic_id)}
+            for topic_id, name in enumerate(self.registry.names)
+        ]
+
+    def _top(self, params: Params) -> Dict:
+        n = _int_param(params, "n", QUERY_TOP_N)
+        if n < 0:
+            raise QueryError(400, "n must not be negative")
+        rank_by = _param(params, "rank_by", "total")
+        if rank_by not in ("total", "recent"):
+            raise QueryError(400, f"Unknown rank_by: {rank_by}")
+
+        columns = self._columns(params)
+        if rank_by == "recent":
+            # Same as the dashboard: the last days of the range
+            columns = columns[-RECENT_DAYS:]
+
+        scores = self.counts[:, columns].sum(axis=1)
+        rows = np.flatnonzero(scores)
+        # Highest first, ties in topic order
+        rows = rows[np.lexsort((rows, -scores[rows]))]
+        if n:
+            rows = rows[:n]
+
+        return {
+            **self._range_bounds(columns),
+            "rank_by": rank_by,
+            "topics": [
+                {"id": self.registry.id_of(self.topic_names[row]), "topic": self.topic_names[row],
+                 "count": int(scores[row])}
+                for row in rows.tolist()
+            ],
+        }
+
+    def _series(self, params: Params) -> Dict:
+        topic = self._topic(params)
+        granularity = _param(params, "granularity", "day")
+        columns = self._columns(params)
+        bounds = self._range_bounds(columns)
+
+        if granularity == "day":
+            row = self.rows.get(topic)
+            values = self.counts[row, columns].tolist() if row is not None else [0] * len(columns)
+            points = dict(zip((self.dates[c] for c in columns), values))
+        elif granularity in GRANULARITIES:
+            if bounds["start"] is None:
+                points = {}
+            else:
+                buckets = self.rollups.buckets(granularity, bounds["start"], bounds["end"])
+                _, counts = self.rollups.matrix(granularity, buckets, [topic])
+                values = counts[0].tolist() if len(counts) else [0] * len(buckets)
+                points = dict(zip(buckets, values))
+        else:
+            raise QueryError(400, f"Unknown granularity: {granularity}")
+
+        return {
+            "id": self.registry.id_of(topic),
+            "topic": topic,
+            "granularity": granularity,
+            **bounds,
+            "counts": points,
+        }
+
+    def _range(self, params: Params) -> Dict:
+        columns = self._columns(params)
+        dates = [self.dates[c] for c in columns]
+
+        if "topic" in params:
+            names = [t for t in params["topic"] if t in self.rows]
+            rows = [self.rows[t] for t in names]
+        else:
+            # Every topic counted in the range
+            rows = np.flatnonzero(self.counts[:, columns].any(axis=1)).tolist()
+            names = [self.topic_names[row] for row in rows]
+
+        counts = self.counts[np.ix_(rows, columns)].tolist() if rows else []
+        return {
+            **self._range_bounds(columns),
+            "topics": {name: dict(zip(dates, values)) for name, values in zip(names, counts)},
+        }
+
+    def _topic(self, params: Params) -> str:
+        if "id" in params:
+            topic_id = _int_param(params, "id", None)
+            if not 0 <= topic_id < len(self.registry):
+                raise QueryError(404, f"Unknown topic id: {topic_id}")
+            return self.registry.name_of(topic_id)
+
+        topic = _param(params, "topic", None)
+        if topic is None:
+            raise QueryError(400, "topic or id is required")
+        if topic not in self.registry and topic not in self.rows:
+            raise QueryError(404, f"Unknown topic: {topic}")
+        return topic
+
+    def _columns(self, params: Params) -> List[int]:
+        """Columns of the held window inside ?start= .. ?end= (inclusive)."""
+        start = _date_param(params, "start")
+        end = _date_param(params, "end")
+        if start and end and start > end:
+            raise QueryError(400, "start is after end")
+
+        return [
+            column for column, d in enumerate(self.dates)
+            if (start is None or d >= start) and (end is None or d <= end)
+        ]
+
+    def _range_bounds(self, columns: List[int]) -> Dict:
+        if not columns:
+            return {"start": None, "end": None}
+        return {"start": self.dates[columns[0]], "end": self.dates[columns[-1]]}
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET only. Every answer carries a strong ETag of its body and
+    Cache-Control: no-cache, so clients revalidate with If-None-Match
+    and get an empty 304 while the data is unchanged.
+    """
+
+    server_version = "TrendQuery/1.0"
+
+    # Keep-alive: pollers reuse one connection for every request.
+    # Headers and body go out in separate writes, so Nagle's algorithm
+    # would hold the body back until the client's delayed ACK
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            body, etag = self.server.service.get(url.path, parse_qs(url.query))
+        except QueryError as error:
+            self._send(error.status, json.dumps({"error": str(error)}).encode("utf-8"))
+            return
+
+        if_none_match = _etags(self.headers.get("If-None-Match"))
+        if etag in if_none_match or "*" in if_none_match:
+            self._send(304, b"", etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(self, status: int, body: bytes, etag: Optional[str] = None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, service: QueryService, host: str = QUERY_HOST, port: int = QUERY_PORT):
+        super().__init__((host, port), QueryRequestHandler)
+        self.service = service
+
+
+def serve(namespace: Optional[str] = None, host: str = QUERY_HOST, port: int = QUERY_PORT):
+    """Serves the stores of namespace until interrupted."""
+    server = QueryServer(QueryService(namespace), host, port)
+    logger.info("Query service listening on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ---------- helpers ----------
+
+def _window_dates(latest: str) -> List[str]:
+    end = date_cls.fromisoformat(latest)
+    return [(end - timedelta(days=offset)).isoformat() for offset in range(WINDOW_DAYS - 1, -1, -1)]
+
+
+def _param(params: Params, name: str, default):
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def _int_param(params: Params, name: str, default):
+    value = _param(params, name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise QueryError(400, f"{name} must be an integer") from None
+
+
+def _date_param(params: Params, name: str) -> Optional[str]:
+    value = _param(params, name, None)
+    if value is None:
+        return None
+    try:
+        return date_cls.fromisoformat(value).isoformat()
+    except ValueError:
+        raise QueryError(400, f"{name} must be a YYYY-MM-DD date") from None
+
+
+def _etags(header: Optional[str]) -> set:
+    if not header:
+        return set()
+    # Weak validators compare equal for GET (RFC 9110)
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
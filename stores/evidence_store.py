@@ -0,0 +1,120 @@
+import json
+import random
+from typing import Dict, List
+
+from config import EVIDENCE_PATH, EVIDENCE_SAMPLE_SIZE
+from stores.atomic import atomic_write
+
+
+class Reservoir:
+    """
+    Uniform sample of at most k items from a stream of unknown
+    length (Algorithm R), plus the number of items offered.
+    """
+
+    __slots__ = ("k", "count", "samples")
+
+    def __init__(self, k: int, count: int = 0, samples: List[str] = None):
+        self.k = k
+        self.count = count
+        self.samples = list(samples or [])[:k]
+
+    def offer(self, item: str, rng: random.Random):
+        self.count += 1
+        if len(self.samples) < self.k:
+            self.samples.append(item)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < self.k:
+                self.samples[slot] = item
+
+    def merge(self, other: "Reservoir", rng: random.Random):
+        """
+        Folds other into this reservoir, drawing each kept sample
+        from either side in proportion to how many items it saw.
+        """
+        mine, theirs = list(self.samples), list(other.samples)
+        weight_mine, weight_theirs = self.count, other.count
+        merged = []
+
+        while len(merged) < self.k and (mine or theirs):
+            total = weight_mine + weight_theirs
+            take_mine = bool(mine) and (not theirs or rng.random() * total < weight_mine)
+            if take_mine:
+                merged.append(mine.pop(rng.randrange(len(mine))))
+                weight_mine -= weight_mine / (len(mine) + 1)
+            else:
+                merged.append(theirs.pop(rng.randrange(len(theirs))))
+                weight_theirs -= weight_theirs / (len(theirs) + 1)
+
+        self.count += other.count
+        self.samples = merged
+
+
+class EvidenceStore:
+    """
+    Bounded example reviews per topic: a reservoir of k texts and
+    the total number of matched reviews, persisted next to the topic
+    store. Memory is constant per topic however many reviews match.
+    """
+
+    def __init__(
+        self,
+        path: str = EVIDENCE_PATH,
+        k: int = EVIDENCE_SAMPLE_SIZE,
+        seed: int = 0
+    ):
+        self.path = path
+        self.k = k
+        self.rng = random.Random(seed)
+        self.reservoirs: Dict[str, Reservoir] = {}
+        self._dirty = False
+
+        try:
+            with open(path, "r") as f:
+                for topic, data in json.load(f).items():
+                    self.reservoirs[topic] = Reservoir(k, data["count"], data["samples"])
+        except (json.JSONDecodeError, FileNotFoundError):
+            pass
+
+    def offer(self, topic: str, text: str):
+        reservoir = self.reservoirs.get(topic)
+        if reservoir is None:
+            reservoir = self.reservoirs[topic] = Reservoir(self.k)
+        reservoir.offer(text, self.rng)
+        self._dirty = True
+
+    def merge(self, source_topic: str, target_topic: str):
+        """
+        Moves a topic's evidence under another name, e.g. when the
+        deduplicator folds a candidate into a canonical topic.
+        """
+        if source_topic == target_topic or source_topic not in self.reservoirs:
+            return
+
+        source = self.reservoirs.pop(source_topic)
+        target = self.reservoirs.get(target_topic)
+        if target is None:
+            self.reservoirs[target_topic] = source
+        else:
+            target.merge(source, self.rng)
+        self._dirty = True
+
+    def samples(self, topic: str) -> List[str]:
+        reservoir = self.reservoirs.get(topic)
+        return list(reservoir.samples) if reservoir else []
+
+    def count(self, topic: str) -> int:
+        reservoir = self.reservoirs.get(topic)
+        return reservoir.count if reservoir else 0
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        with atomic_write(self.path) as f:
+            json.dump({
+                topic: {"count": r.count, "samples": r.samples}
+                for topic, r in self.reservoirs.items()
+            }, f, indent=2)
+        self._dirty = False
@@ -0,0 +1,81 @@
+import json
+import os
+import shutil
+from typing import Dict, Optional
+
+from config import (
+    APP_STORAGE_ROOT, CHECKPOINT_DIR, EVIDENCE_PATH, NEAR_DUPLICATES_REPORT_NAME,
+    OUTPUT_DIR, RUN_MANIFEST_PATH, SEEN_REVIEWS_PATH, TOPIC_JOURNAL_PATH, TOPIC_STORE_PATH,
+    TREND_DB_PATH, TREND_MATRIX_DIR, TREND_ROLLUP_PATH, TREND_STORE_PATH, TREND_VERSION_PATH
+)
+
+
+def storage_paths(namespace: Optional[str] = None) -> Dict[str, str]:
+    """
+    Every per-run store path. Without a namespace these are the
+    global paths from config.py; with one (an app id in batch runs)
+    they live under storage/apps/<namespace>/ and output/<namespace>/
+    so concurrent apps never overwrite each other. Seed topics and
+    the raw review cache stay shared.
+    """
+    if namespace is None:
+        return {
+            "topic_store": TOPIC_STORE_PATH,
+            "topic_journal": TOPIC_JOURNAL_PATH,
+            "evidence": EVIDENCE_PATH,
+            "trend_json": TREND_STORE_PATH,
+            "trend_db": TREND_DB_PATH,
+            "trend_matrix": TREND_MATRIX_DIR,
+            "trend_rollups": TREND_ROLLUP_PATH,
+            "trend_version": TREND_VERSION_PATH,
+            "seen_reviews": SEEN_REVIEWS_PATH,
+            "manifest": RUN_MANIFEST_PATH,
+            "checkpoint": CHECKPOINT_DIR,
+            "output_dir": OUTPUT_DIR,
+            "near_duplicates": os.path.join(OUTPUT_DIR, NEAR_DUPLICATES_REPORT_NAME),
+        }
+
+    root = os.path.join(APP_STORAGE_ROOT, namespace)
+    return {
+        "topic_store": os.path.join(root, "topic_store", "topics.json"),
+        "topic_journal": os.path.join(root, "topic_store", "topics.journal"),
+        "evidence": os.path.join(root, "topic_store", "evidence.json"),
+        "trend_json": os.path.join(root, "trend_store", "trends.json"),
+        "trend_db": os.path.join(root, "trend_store", "trends.db"),
+        "trend_matrix": os.path.join(root, "trend_store", "matrix"),
+        "trend_rollups": os.path.join(root, "trend_store", "rollups.json"),
+        "trend_version": os.path.join(root, "trend_store", "version.json"),
+        "seen_reviews": os.path.join(root, "review_store", "seen_reviews"),
+        "manifest": os.path.join(root, "run_manifest.json"),
+        "checkpoint": os.path.join(root, "checkpoint"),
+        "output_dir": os.path.join(OUTPUT_DIR, namespace),
+        "near_duplicates": os.path.join(OUTPUT_DIR, namespace, NEAR_DUPLICATES_REPORT_NAME),
+    }
+
+
+def reset_storage(namespace: Optional[str] = None):
+    """
+    Empties the topic, trend and seen-review stores of a namespace and
+    forgets its run progress and near-duplicate counts (seed topics
+    and cached raw reviews are kept).
+    """
+    paths = storage_paths(namespace)
+
+    for key in ("topic_store", "trend_json", "seen_reviews"):
+        os.makedirs(os.path.dirname(paths[key]), exist_ok=True)
+
+    with open(paths["topic_store"], "w") as f:
+        json.dump({}, f)
+
+    with open(paths["trend_json"], "w") as f:
+        json.dump({}, f)
+
+    for key in (
+        "topic_journal", "trend_db", "trend_rollups", "trend_version",
+        "evidence", "manifest", "near_duplicates"
+    ):
+        if os.path.exists(paths[key]):
+            os.remove(paths[key])
+
+    for key in ("trend_matrix", "seen_reviews", "checkpoint"):
+        shutil.rmtree(paths[key], ignore_errors=True)
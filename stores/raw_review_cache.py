@@ -0,0 +1,148 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import List, Dict, Optional
+
+from config import RAW_REVIEW_PATH
+from stores.atomic import atomic_write
+
+logger = logging.getLogger(__name__)
+
+class RawReviewCache:
+    """
+    On-disk cache of raw Google Play pages.
+
+    Layout:
+        storage/raw_reviews/<app_id>/<session>/page_00000.jsonl.gz
+        storage/raw_reviews/<app_id>/<session>/cursors.json
+
+    A session is one NEWEST-first paging pass (continued, not
+    restarted, on resume), named by the time it started. Each page is
+    one gzip-compressed JSONL file keyed by its position in that pass,
+    so a later pass never overwrites or gets stitched onto an earlier
+    one. cursors.json holds the continuation token returned after
+    each page, the newest and oldest review day on each page and the
+    oldest day the pass reached; it is written once per session,
+    after its pages, so a page listed there is complete.
+
+    A new session makes the older ones it reaches as far back as
+    redundant, and they are removed when it is saved.
+    """
+
+    def __init__(self, root: str = RAW_REVIEW_PATH):
+        self.root = root
+
+    def new_session(self, app_id: str) -> str:
+        session = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        os.makedirs(os.path.join(self._app_dir(app_id), session), exist_ok=True)
+        return session
+
+    def save_page(self, app_id: str, session: str, page_index: int, reviews: List[Dict]):
+        with atomic_write(self._page_path(app_id, session, page_index), "wb") as raw:
+            with gzip.open(raw, "wt", encoding="utf-8") as f:
+                for review in reviews:
+                    f.write(json.dumps(review, default=self._encode))
+                    f.write("\n")
+
+    def load_page(self, app_id: str, session: str, page_index: int) -> Optional[List[Dict]]:
+        """
+        Returns the cached page, or None if it was never fetched.
+        """
+        path = self._page_path(app_id, session, page_index)
+        if not os.path.exists(path):
+            return None
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def save_session(
+        self,
+        app_id: str,
+        session: str,
+        tokens: List[Optional[str]],
+        spans: List[Optional[List[str]]],
+        oldest: Optional[str]
+    ):
+        """
+        Records a session's cursor map: tokens[i] is the continuation
+        token after page i (None after the last page there is),
+        spans[i] its [newest, oldest] review day (None if empty), and
+        oldest the oldest review day paged through.
+        """
+        with atomic_write(self._cursors_path(app_id, session)) as f:
+            json.dump({"tokens": tokens, "spans": spans, "oldest": oldest}, f)
+        self._prune(app_id, session)
+
+    def load_session(self, app_id: str, session: str) -> Optional[Dict]:
+        """
+        {"tokens": [...], "spans": [...], "oldest": day} of a saved
+        session, else None.
+        """
+        try:
+            with open(self._cursors_path(app_id, session), "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+
+    def sessions(self, app_id: str) -> List[str]:
+        """Saved sessions of app_id, oldest first."""
+        try:
+            names = sorted(os.listdir(self._app_dir(app_id)))
+        except FileNotFoundError:
+            return []
+        return [name for name in names if os.path.exists(self._cursors_path(app_id, name))]
+
+    def latest_session(self, app_id: str) -> Optional[str]:
+        sessions = self.sessions(app_id)
+        return sessions[-1] if sessions else None
+
+    def find_session(self, app_id: str, start: str) -> Optional[str]:
+        """
+        The newest session that paged back past start (or to the end
+        of the app's reviews); the newest one at all if none did.
+        """
+        sessions = self.sessions(app_id)
+        for session in reversed(sessions):
+            if self._reaches(self.load_session(app_id, session), start):
+                return session
+        return sessions[-1] if sessions else None
+
+    # ---------- helpers ----------
+
+    def _app_dir(self, app_id: str) -> str:
+        return os.path.join(self.root, app_id)
+
+    def _cursors_path(self, app_id: str, session: str) -> str:
+        return os.path.join(self._app_dir(app_id), session, "cursors.json")
+
+    def _page_path(self, app_id: str, session: str, page_index: int) -> str:
+        return os.path.join(self._app_dir(app_id), session, f"page_{page_index:05d}.jsonl.gz")
+
+    @staticmethod
+    def _reaches(data: Optional[Dict], start: str) -> bool:
+        if not data or not data["tokens"]:
+            return False
+        return data["tokens"][-1] is None or (data["oldest"] is not None and data["oldest"] < start)
+
+    def _prune(self, app_id: str, session: str):
+        """Removes older sessions that session reaches as far back as."""
+        current = self.load_session(app_id, session)
+        for older in self.sessions(app_id):
+            if older >= session:
+                break
+            data = self.load_session(app_id, older)
+            if current["tokens"][-1] is None or (
+                data["oldest"] is not None and current["oldest"] is not None
+                and current["oldest"] <= data["oldest"]
+            ):
+                shutil.rmtree(os.path.join(self._app_dir(app_id), older), ignore_errors=True)
+                logger.info("Removed raw review session %s of %s", older, app_id)
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return str(value)
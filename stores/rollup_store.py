@@ -0,0 +1,131 @@
+import json
+from datetime import date as date_cls, timedelta
+from typing import Dict, List, Optional, Iterable, Tuple
+
+import numpy as np
+
+from config import TREND_ROLLUP_PATH
+from stores.atomic import atomic_write
+
+GRANULARITIES = ("week", "month")
+
+
+class RollupStore:
+    """
+    Weekly and monthly totals per topic, kept up to date as each day
+    is counted so long-horizon reports never rescan daily cells.
+
+    granularity -> topic -> bucket -> count, where a week bucket is
+    its ISO week ("2024-W40", Monday to Sunday) and a month bucket is
+    "2024-10". Buckets are whole calendar periods, so the first and
+    last bucket of a window may include days outside of it.
+    """
+
+    def __init__(self, path: str = TREND_ROLLUP_PATH):
+        self.path = path
+        self._dirty = False
+
+        try:
+            with open(path, "r") as f:
+                self.data: Dict[str, Dict[str, Dict[str, int]]] = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            self.data = {}
+
+        for granularity in GRANULARITIES:
+            self.data.setdefault(granularity, {})
+
+    def add_day(
+        self,
+        date: str,
+        counts: Dict[str, int],
+        previous: Optional[Dict[str, int]] = None
+    ):
+        """
+        Adds one day's counts to its week and month. previous holds
+        the counts already rolled up for that date, if it is being
+        recorded again, so only the difference is applied.
+        """
+        day = date_cls.fromisoformat(date)
+        previous = previous or {}
+
+        for granularity in GRANULARITIES:
+            bucket = bucket_key(granularity, day)
+            topics = self.data[granularity]
+            for topic, count in counts.items():
+                buckets = topics.setdefault(topic, {})
+                buckets[bucket] = buckets.get(bucket, 0) + count - previous.get(topic, 0)
+
+        self._dirty = True
+
+    def prune(self, cutoff: str):
+        """Drops every bucket that ends strictly before cutoff."""
+        cutoff_day = date_cls.fromisoformat(cutoff)
+
+        for granularity in GRANULARITIES:
+            for buckets in self.data[granularity].values():
+                stale = [b for b in buckets if bucket_end(granularity, b) < cutoff_day]
+                for bucket in stale:
+                    del buckets[bucket]
+                    self._dirty = True
+
+    def buckets(self, granularity: str, start: str, end: str) -> List[str]:
+        """Keys of every bucket overlapping start .. end, in order."""
+        day = date_cls.fromisoformat(start)
+        last = bucket_key(granularity, date_cls.fromisoformat(end))
+
+        keys = [bucket_key(granularity, day)]
+        while keys[-1] != last:
+            day = bucket_end(granularity, keys[-1]) + timedelta(days=1)
+            keys.append(bucket_key(granularity, day))
+        return keys
+
+    def matrix(
+        self,
+        granularity: str,
+        buckets: List[str],
+        topics: Optional[Iterable[str]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        (topic names, topics x buckets int matrix), the same shape as
+        TrendStore.matrix() so reports can render either.
+        """
+        data = self.data[granularity]
+        names = list(data) if topics is None else [t for t in topics if t in data]
+
+        counts = np.zeros((len(names), len(buckets)), dtype=np.int64)
+        for row, topic in enumerate(names):
+            topic_buckets = data[topic]
+            counts[row] = [topic_buckets.get(b, 0) for b in buckets]
+
+        return names, counts
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        with atomic_write(self.path) as f:
+            json.dump(self.data, f, indent=2)
+        self._dirty = False
+
+
+# ---------- helpers ----------
+
+def bucket_key(granularity: str, day: date_cls) -> str:
+    if granularity == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return f"{day.year}-{day.month:02d}"
+    raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+
+def bucket_end(granularity: str, bucket: str) -> date_cls:
+    """Last day of a bucket."""
+    if granularity == "week":
+        year, week = bucket.split("-W")
+        return date_cls.fromisocalendar(int(year), int(week), 7)
+    if granularity == "month":
+        year, month = (int(part) for part in bucket.split("-"))
+        first_of_next = date_cls(year + month // 12, month % 12 + 1, 1)
+        return first_of_next - timedelta(days=1)
+    raise ValueError(f"Unknown rollup granularity: {granularity}")
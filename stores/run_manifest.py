@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+from typing import Dict, Optional
+
+from config import CHECKPOINT_DIR, RUN_MANIFEST_PATH
+from stores.atomic import atomic_copy, atomic_write
+
+
+class RunManifest:
+    """
+    Progress of a multi-day run: its app and date range, every
+    completed day with the ingestion cursor after it, and a checkpoint
+    copy of the small JSON stores as of the latest completed day.
+
+    Large stores are not copied. Trend cells and seen reviews carry
+    their date, so DailyController drops whatever an interrupted day
+    wrote to them instead.
+    """
+
+    def __init__(self, path: str = RUN_MANIFEST_PATH, checkpoint_dir: str = CHECKPOINT_DIR):
+        self.path = path
+        self.checkpoint_dir = checkpoint_dir
+
+        try:
+            with open(path, "r") as f:
+                self.data = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            self.data = {}
+
+    def begin(self, app_id: str, start: str, end: str):
+        self.data = {"app_id": app_id, "start": start, "end": end, "completed": {}}
+        self._save()
+
+    @property
+    def started(self) -> bool:
+        return "app_id" in self.data
+
+    def is_completed(self, date: str) -> bool:
+        return date in self.data.get("completed", {})
+
+    def last_completed(self) -> Optional[Dict]:
+        """{"date", "day_index", "cursor"} of the latest completed day."""
+        completed = self.data.get("completed", {})
+        if not completed:
+            return None
+
+        date = max(completed)
+        return {"date": date, **completed[date]}
+
+    def complete_day(self, date: str, day_index: int, cursor: Dict, files: Dict[str, str]):
+        """
+        Marks date as done. files (name -> path) are copied into a
+        fresh checkpoint directory first; the manifest only points at
+        it once every copy is in place.
+        """
+        checkpoint = os.path.join(self.checkpoint_dir, date)
+        saved = {}
+        for name, path in files.items():
+            if os.path.exists(path):
+                atomic_copy(path, os.path.join(checkpoint, name))
+                saved[name] = path
+
+        previous = self.data.get("checkpoint")
+        self.data["completed"][date] = {"day_index": day_index, "cursor": cursor}
+        self.data["checkpoint"] = {"dir": checkpoint, "files": saved}
+        self._save()
+
+        if previous and previous["dir"] != checkpoint:
+            shutil.rmtree(previous["dir"], ignore_errors=True)
+
+    def restore_checkpoint(self, files: Dict[str, str]):
+        """
+        Puts files (name -> path) back as of the latest completed day.
+        A file that did not exist then is removed.
+        """
+        checkpoint = self.data.get("checkpoint") or {"dir": None, "files": {}}
+
+        for name, path in files.items():
+            if name in checkpoint["files"]:
+                atomic_copy(os.path.join(checkpoint["dir"], name), path)
+            elif os.path.exists(path):
+                os.remove(path)
+
+    # ---------- helpers ----------
+
+    def _save(self):
+        with atomic_write(self.path) as f:
+            json.dump(self.data, f, indent=2)
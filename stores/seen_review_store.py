@@ -0,0 +1,152 @@
+import os
+from datetime import date as date_cls
+from typing import List
+
+import numpy as np
+
+from config import SEEN_REVIEWS_PATH
+
+# One fixed-size record per review: the first 8 bytes of its md5
+# digest and the ordinal of the day it was counted on
+RECORD = np.dtype([("digest", "<u8"), ("day", "<u4")])
+
+
+class SeenReviewStore:
+    """
+    Compact set of already-counted reviews.
+
+    Digests are kept as a sorted uint64 array (plus a parallel day
+    array) so membership checks for a whole batch are one vectorized
+    binary search. On disk every day is its own append-only segment
+    of 12-byte records (<path>/<YYYY-MM-DD>.bin), so expiring or
+    discarding days deletes their segments and nothing is rewritten.
+    Ten million reviews take about 120 MB in memory.
+
+    Hashes added during a day are held in a dict next to the array and
+    merged into it once, by flush().
+    """
+
+    def __init__(self, path: str = SEEN_REVIEWS_PATH):
+        self.path = path
+
+        segments = []
+        for name in self._segment_names():
+            # Whole records only: a crash mid-append can leave a torn
+            # last record, which is dropped here
+            segment = os.path.join(path, name)
+            count = os.path.getsize(segment) // RECORD.itemsize
+            segments.append(np.fromfile(segment, dtype=RECORD, count=count))
+        records = np.concatenate(segments) if segments else np.empty(0, dtype=RECORD)
+
+        # Keep the first occurrence of each digest, sorted by digest
+        self.digests, first = np.unique(records["digest"], return_index=True)
+        self.days = records["day"][first]
+
+        # Added since the last flush(): digest -> day ordinal
+        self._pending = {}
+
+    def __len__(self) -> int:
+        return len(self.digests) + len(self._pending)
+
+    def contains(self, review_hashes: List[str]) -> np.ndarray:
+        """
+        Batch membership check; returns one bool per hash.
+        """
+        return self._contains_digests(self._to_digests(review_hashes))
+
+    def add(self, review_hashes: List[str], date: str):
+        """
+        Records the hashes as seen on date: appended to the day's
+        segment now, merged into the sorted array by flush().
+        """
+        keys = np.unique(self._to_digests(review_hashes))
+        keys = keys[~self._contains_digests(keys)]
+        if not len(keys):
+            return
+
+        day = date_cls.fromisoformat(date).toordinal()
+        records = np.empty(len(keys), dtype=RECORD)
+        records["digest"] = keys
+        records["day"] = day
+
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._segment_path(date), "ab") as f:
+            records.tofile(f)
+
+        self._pending.update(dict.fromkeys(keys.tolist(), day))
+
+    def flush(self):
+        """
+        Merges the hashes added since the last call into the sorted
+        array; one O(n) merge per counted day.
+        """
+        if not self._pending:
+            return
+
+        keys = np.fromiter(self._pending, dtype=np.uint64, count=len(self._pending))
+        days = np.fromiter(self._pending.values(), dtype=np.uint32, count=len(self._pending))
+        order = np.argsort(keys)
+        keys, days = keys[order], days[order]
+
+        pos = np.searchsorted(self.digests, keys)
+        self.digests = np.insert(self.digests, pos, keys)
+        self.days = np.insert(self.days, pos, days)
+        self._pending = {}
+
+    def expire(self, cutoff: str):
+        """
+        Forgets every review counted before cutoff (YYYY-MM-DD).
+        """
+        self._drop(lambda day: day < cutoff)
+
+    def discard_from(self, date: str):
+        """
+        Forgets every review counted on or after date, e.g. those of a
+        day interrupted before its checkpoint.
+        """
+        self._drop(lambda day: day >= date)
+
+    # ---------- helpers ----------
+
+    def _drop(self, dropped):
+        names = [name for name in self._segment_names() if dropped(name[:-len(".bin")])]
+        if not names:
+            return
+
+        self.flush()
+        ordinals = [date_cls.fromisoformat(name[:-len(".bin")]).toordinal() for name in names]
+        keep = ~np.isin(self.days, np.array(ordinals, dtype=np.uint32))
+        self.digests = self.digests[keep]
+        self.days = self.days[keep]
+
+        for name in names:
+            os.remove(os.path.join(self.path, name))
+
+    def _contains_digests(self, keys: np.ndarray) -> np.ndarray:
+        if len(self.digests):
+            pos = np.minimum(np.searchsorted(self.digests, keys), len(self.digests) - 1)
+            seen = self.digests[pos] == keys
+        else:
+            seen = np.zeros(len(keys), dtype=bool)
+        if self._pending:
+            pending = self._pending
+            seen |= np.fromiter((key in pending for key in keys.tolist()), dtype=bool, count=len(keys))
+        return seen
+
+    def _segment_path(self, date: str) -> str:
+        return os.path.join(self.path, f"{date}.bin")
+
+    def _segment_names(self) -> List[str]:
+        try:
+            return sorted(name for name in os.listdir(self.path) if name.endswith(".bin"))
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _to_digests(review_hashes: List[str]) -> np.ndarray:
+        # md5 hex digest -> its first 8 bytes as an unsigned 64-bit int
+        return np.fromiter(
+            (int(h[:16], 16) for h in review_hashes),
+            dtype=np.uint64,
+            count=len(review_hashes)
+        )
@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional
+
+from stores.atomic import atomic_write
+from config import TOPIC_JOURNAL_COMPACT_ENTRIES, TOPIC_STORE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class TopicRegistry(Mapping):
+    """
+    Canonical topics, resident for the whole run. Every topic gets a
+    compact integer id in order of creation; reading it as a mapping
+    gives the topic store layout, name -> {"aliases", "created_on",
+    "last_updated"}, in id order.
+
+    Changes (new topic, new alias, new last_updated) are appended to a
+    journal of JSON lines on commit(). Once it holds compact_after
+    entries, and at least as many as there are topics (so rewriting
+    the snapshot stays amortized O(1) per change), the whole registry
+    is written to the snapshot (the old topics.json layout, so ids are
+    positions) and the journal starts over. Loading reads the snapshot
+    and replays the journal; replaying an entry the snapshot already
+    holds changes nothing, so a crash between the two writes loses
+    nothing.
+    """
+
+    def __init__(
+        self,
+        path: str = TOPIC_STORE_PATH,
+        journal_path: Optional[str] = None,
+        compact_after: int = TOPIC_JOURNAL_COMPACT_ENTRIES
+    ):
+        # topics.json -> topics.journal next to it unless given
+        self.path = path
+        self.journal_path = journal_path or os.path.splitext(path)[0] + ".journal"
+        self.compact_after = compact_after
+
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self._records: List[Dict] = []
+
+        # Entries not yet in the journal / already in it
+        self._pending: List[Dict] = []
+        self._journaled = 0
+        self._torn_at: Optional[int] = None
+
+        for name, record in self._read_snapshot().items():
+            self._add(name, record["aliases"], record["created_on"], record["last_updated"])
+        self._replay_journal()
+
+    def __getitem__(self, name: str) -> Dict:
+        return self._records[self.ids[name]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return name in self.ids
+
+    def id_of(self, name: str) -> Optional[int]:
+        return self.ids.get(name)
+
+    def name_of(self, topic_id: int) -> str:
+        return self.names[topic_id]
+
+    def record(self, topic_id: int) -> Dict:
+        return self._records[topic_id]
+
+    def add(self, name: str, date: str) -> int:
+        """Id of topic name, created (dated date) if it is new."""
+        topic_id = self.ids.get(name)
+        if topic_id is None:
+            topic_id = self._add(name, [], date, date)
+            self._pending.append({"op": "topic", "id": topic_id, "name": name, "date": date})
+        return topic_id
+
+    def add_alias(self, topic_id: int, alias: str) -> bool:
+        """Adds alias to a topic; False if it already had it."""
+        aliases = self._records[topic_id]["aliases"]
+        if alias in aliases:
+            return False
+
+        aliases.append(alias)
+        self._pending.append({"op": "alias", "id": topic_id, "alias": alias})
+        return True
+
+    def touch(self, topic_id: int, date: str):
+        """Sets a topic's last_updated; journaled only when it changes."""
+        record = self._records[topic_id]
+        if record["last_updated"] != date:
+            record["last_updated"] = date
+            self._pending.append({"op": "touch", "id": topic_id, "date": date})
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def commit(self):
+        """
+        Appends the changes since the last commit to the journal, and
+        compacts it into the snapshot once it is long enough. Writes
+        nothing when nothing changed.
+        """
+        if not self._pending:
+            return
+
+        if self._journaled + len(self._pending) >= max(self.compact_after, len(self.names)):
+            self.compact()
+            return
+
+        os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+        with open(self.journal_path, "a") as f:
+            if self._torn_at is not None:
+                f.truncate(self._torn_at)
+                self._torn_at = None
+            f.writelines(json.dumps(entry) + "\n" for entry in self._pending)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._journaled += len(self._pending)
+        self._pending = []
+
+    def compact(self):
+        """Writes the whole registry to the snapshot and empties the journal."""
+        with atomic_write(self.path) as f:
+            json.dump(dict(self.items()), f)
+
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+        logger.info("Topic registry compacted: %d topics", len(self.names))
+        self._journaled = 0
+        self._torn_at = None
+        self._pending = []
+
+    # ---------- helpers ----------
+
+    def _add(self, name: str, aliases: List[str], created_on: str, last_updated: str) -> int:
+        topic_id = len(self.names)
+        self.names.append(name)
+        self.ids[name] = topic_id
+        self._records.append({
+            "aliases": list(aliases),
+            "created_on": created_on,
+            "last_updated": last_updated
+        })
+        return topic_id
+
+    def _read_snapshot(self) -> Dict:
+        try:
+            with open(self.path, "r") as f:
+                content = f.read().strip()
+                return json.loads(content) if content else {}
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _replay_journal(self):
+        try:
+            with open(self.journal_path, "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        offset = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                entry = None
+            if entry is None or not line.endswith(b"\n"):
+                # Torn last line of an interrupted commit: the next
+                # commit cuts it off before appending
+                logger.warning("Ignoring torn entry at the end of %s", self.journal_path)
+                self._torn_at = offset
+                break
+
+            op = entry["op"]
+            if op == "topic":
+                if entry["name"] not in self.ids:
+                    self._add(entry["name"], [], entry["date"], entry["date"])
+            elif op == "alias":
+                aliases = self._records[entry["id"]]["aliases"]
+                if entry["alias"] not in aliases:
+                    aliases.append(entry["alias"])
+            elif op == "touch":
+                self._records[entry["id"]]["last_updated"] = entry["date"]
+
+            offset += len(line)
+            self._journaled += 1
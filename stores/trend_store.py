@@ -0,0 +1,416 @@
+import json
+import os
+import sqlite3
+from datetime import date as date_cls
+from typing import Dict, List, Optional, Iterable, Tuple
+
+import numpy as np
+
+from stores.atomic import atomic_write
+from config import (
+    TREND_STORE_BACKEND, TREND_STORE_PATH, TREND_DB_PATH, TREND_MATRIX_DIR,
+    WINDOW_DAYS
+)
+
+SQLITE_MAX_IN = 500
+
+
+class TrendStore:
+    """
+    Per-topic daily counts: topic -> date (YYYY-MM-DD) -> count.
+
+    TopicCounterAgent writes one day at a time with record_day(),
+    prunes the sliding window with prune() and then calls flush().
+    ReportGeneratorAgent reads through window().
+    """
+
+    def record_day(self, date: str, counts: Dict[str, int]):
+        raise NotImplementedError
+
+    def prune(self, cutoff: str):
+        """Drops every count dated strictly before cutoff."""
+        raise NotImplementedError
+
+    def discard_from(self, date: str):
+        """
+        Drops every count dated on or after date, e.g. the cells of a
+        day interrupted before its checkpoint.
+        """
+        raise NotImplementedError
+
+    def window(
+        self,
+        dates: List[str],
+        topics: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Counts for the given dates only, of every topic or of the
+        given topics.
+        """
+        raise NotImplementedError
+
+    def matrix(
+        self,
+        dates: List[str],
+        topics: Optional[Iterable[str]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Same data as window(), as (topic names, topics x dates int
+        matrix). Missing cells are 0.
+        """
+        data = self.window(dates, topics)
+        column = {d: i for i, d in enumerate(dates)}
+
+        counts = np.zeros((len(data), len(dates)), dtype=np.int64)
+        for row, date_counts in enumerate(data.values()):
+            for d, count in date_counts.items():
+                counts[row, column[d]] = count
+
+        return list(data), counts
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def export_json(self, path: Optional[str] = None):
+        path = path or self.json_path
+        with atomic_write(path) as f:
+            json.dump(self.load(), f, indent=2)
+
+
+class JsonTrendStore(TrendStore):
+    """
+    The original trends.json layout, kept in memory between days and
+    rewritten in full on every flush.
+    """
+
+    def __init__(self, path: str = TREND_STORE_PATH):
+        self.path = path
+        self.json_path = path
+        self._data = None
+
+    def record_day(self, date: str, counts: Dict[str, int]):
+        data = self.load()
+        for topic, count in counts.items():
+            data.setdefault(topic, {})[date] = count
+
+    def prune(self, cutoff: str):
+        for date_counts in self.load().values():
+            for d in [d for d in date_counts if d < cutoff]:
+                del date_counts[d]
+
+    def discard_from(self, date: str):
+        for date_counts in self.load().values():
+            for d in [d for d in date_counts if d >= date]:
+                del date_counts[d]
+
+    def window(
+        self,
+        dates: List[str],
+        topics: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        data = self.load()
+        if topics is not None:
+            data = {topic: data[topic] for topic in topics if topic in data}
+
+        return {
+            topic: {d: date_counts[d] for d in dates if d in date_counts}
+            for topic, date_counts in data.items()
+        }
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        if self._data is None:
+            try:
+                with open(self.path, "r") as f:
+                    content = f.read().strip()
+                    self._data = json.loads(content) if content else {}
+            except (json.JSONDecodeError, FileNotFoundError):
+                self._data = {}
+        return self._data
+
+    def flush(self):
+        self.export_json(self.path)
+
+
+class SqliteTrendStore(TrendStore):
+    """
+    Trend counts in an indexed (topic id, date) -> count table.
+    Each day upserts only that day's cells and window pruning is a
+    single ranged DELETE, so per-day I/O no longer grows with history.
+
+    Topic names are stored once, in a topics table of integer ids
+    that stays resident; count rows carry only the id. A database
+    written with the older (topic name, date) layout is converted on
+    first use.
+    """
+
+    def __init__(self, path: str = TREND_DB_PATH, json_path: str = TREND_STORE_PATH):
+        self.path = path
+        self.json_path = json_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.topics: List[str] = []
+        self.topic_ids: Dict[str, int] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # Opened (and the file created) on first use, not on construction
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS topics ("
+                " id INTEGER PRIMARY KEY,"
+                " name TEXT NOT NULL UNIQUE"
+                ")"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS topic_counts ("
+                " topic_id INTEGER NOT NULL,"
+                " date TEXT NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " PRIMARY KEY (topic_id, date)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS topic_counts_by_date ON topic_counts (date)"
+            )
+            self._conn.commit()
+
+            for topic_id, name in self._conn.execute("SELECT id, name FROM topics ORDER BY id"):
+                self.topic_ids[name] = topic_id
+                self.topics.append(name)
+        return self._conn
+
+    def record_day(self, date: str, counts: Dict[str, int]):
+        rows = [(self._topic_id(topic), date, count) for topic, count in counts.items()]
+        self.conn.executemany(
+            "INSERT INTO topic_counts (topic_id, date, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (topic_id, date) DO UPDATE SET count = excluded.count",
+            rows
+        )
+
+    def prune(self, cutoff: str):
+        self.conn.execute("DELETE FROM topic_counts WHERE date < ?", (cutoff,))
+
+    def discard_from(self, date: str):
+        self.conn.execute("DELETE FROM topic_counts WHERE date >= ?", (date,))
+
+    def window(
+        self,
+        dates: List[str],
+        topics: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        if not dates:
+            return {}
+
+        query = "SELECT topic_id, date, count FROM topic_counts WHERE date BETWEEN ? AND ?"
+        params = [min(dates), max(dates)]
+        conn = self.conn
+
+        if topics is not None:
+            ids = [self.topic_ids[topic] for topic in topics if topic in self.topic_ids]
+            if not ids:
+                return {}
+            # Stay well inside SQLite's bound-parameter limit
+            if len(ids) <= SQLITE_MAX_IN:
+                query += f" AND topic_id IN ({', '.join('?' * len(ids))})"
+                params += ids
+            else:
+                wanted = set(ids)
+                rows = conn.execute(query, params)
+                return self._group(r for r in rows if r[0] in wanted)
+
+        return self._group(conn.execute(query, params))
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        rows = self.conn.execute("SELECT topic_id, date, count FROM topic_counts")
+        return self._group(rows)
+
+    def flush(self):
+        self.conn.commit()
+
+    # ---------- helpers ----------
+
+    def _group(self, rows) -> Dict[str, Dict[str, int]]:
+        grouped: Dict[str, Dict[str, int]] = {}
+        names = self.topics
+        for topic_id, date, count in rows:
+            grouped.setdefault(names[topic_id], {})[date] = count
+        return grouped
+
+    def _topic_id(self, topic: str) -> int:
+        conn = self.conn
+        topic_id = self.topic_ids.get(topic)
+        if topic_id is None:
+            topic_id = len(self.topics)
+            conn.execute("INSERT INTO topics (id, name) VALUES (?, ?)", (topic_id, topic))
+            self.topic_ids[topic] = topic_id
+            self.topics.append(topic)
+        return topic_id
+
+
+class MatrixTrendStore(TrendStore):
+    """
+    Trend counts as a dense topics x days int matrix whose day axis is
+    a ring buffer of window_days columns: a day lives in column
+    ordinal % window_days, and the ordinal stored per column tells
+    which day a column currently holds. Topic names map to row ids
+    in order of first appearance.
+
+    Recording a new day resets the column it reuses, which is also
+    what slides the window; prune() only clears columns older than
+    the cutoff. Everything outside the last window_days days is gone.
+
+    On disk: counts.npy, days.npy and topics.json in one directory.
+    With mmap=True the counts are memory-mapped read-only, for
+    readers that never record.
+    """
+
+    def __init__(
+        self,
+        directory: str = TREND_MATRIX_DIR,
+        json_path: str = TREND_STORE_PATH,
+        window_days: int = WINDOW_DAYS,
+        mmap: bool = False
+    ):
+        self.directory = directory
+        self.json_path = json_path
+        self.window_days = window_days
+        self._dirty = False
+
+        self.topics: List[str] = []
+        self.topic_ids: Dict[str, int] = {}
+
+        counts_path = os.path.join(directory, "counts.npy")
+        if os.path.exists(counts_path):
+            with open(os.path.join(directory, "topics.json"), "r") as f:
+                self.topics = json.load(f)
+            self.topic_ids = {topic: i for i, topic in enumerate(self.topics)}
+            self._days = np.load(os.path.join(directory, "days.npy"))
+            self._counts = np.load(counts_path, mmap_mode="r" if mmap else None)
+        else:
+            # Day ordinal held by each column; 0 = empty
+            self._days = np.zeros(window_days, dtype=np.int64)
+            self._counts = np.zeros((0, window_days), dtype=np.int64)
+
+        # Names already in topics.json, which only new topics rewrite
+        self._saved_topics = len(self.topics)
+
+        if self._counts.shape[1] != window_days:
+            raise ValueError(
+                f"{counts_path} holds {self._counts.shape[1]} days, "
+                f"expected WINDOW_DAYS = {window_days}"
+            )
+
+    def record_day(self, date: str, counts: Dict[str, int]):
+        day = date_cls.fromisoformat(date).toordinal()
+        if day <= self._days.max() - self.window_days:
+            # Already outside the window
+            return
+
+        column = day % self.window_days
+        if self._days[column] != day:
+            self._counts[:, column] = 0
+            self._days[column] = day
+
+        rows = [self._topic_id(topic) for topic in counts]
+        self._counts[rows, column] = list(counts.values())
+        self._dirty = True
+
+    def prune(self, cutoff: str):
+        stale = (self._days > 0) & (self._days < date_cls.fromisoformat(cutoff).toordinal())
+        self._clear(stale)
+
+    def discard_from(self, date: str):
+        self._clear(self._days >= date_cls.fromisoformat(date).toordinal())
+
+    def matrix(
+        self,
+        dates: List[str],
+        topics: Optional[Iterable[str]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        days = np.array([date_cls.fromisoformat(d).toordinal() for d in dates], dtype=np.int64)
+        columns = days % self.window_days
+        held = self._days[columns] == days
+
+        if topics is None:
+            names = list(self.topics)
+            rows = self._counts[:len(names)]
+        else:
+            names = [topic for topic in topics if topic in self.topic_ids]
+            rows = self._counts[[self.topic_ids[topic] for topic in names]]
+
+        return names, np.where(held, rows[:, columns], 0)
+
+    def window(
+        self,
+        dates: List[str],
+        topics: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        names, counts = self.matrix(dates, topics)
+        return {
+            topic: dict(zip(dates, row))
+            for topic, row in zip(names, counts.tolist())
+        }
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        order = np.argsort(self._days)
+        order = order[self._days[order] > 0]
+        dates = [date_cls.fromordinal(int(d)).isoformat() for d in self._days[order]]
+        return self.window(dates)
+
+    def flush(self):
+        if not self._dirty:
+            return
+
+        with atomic_write(os.path.join(self.directory, "counts.npy"), "wb") as f:
+            np.save(f, self._counts[:len(self.topics)])
+        with atomic_write(os.path.join(self.directory, "days.npy"), "wb") as f:
+            np.save(f, self._days)
+        if len(self.topics) != self._saved_topics:
+            with atomic_write(os.path.join(self.directory, "topics.json")) as f:
+                json.dump(self.topics, f)
+            self._saved_topics = len(self.topics)
+        self._dirty = False
+
+    # ---------- helpers ----------
+
+    def _clear(self, columns: np.ndarray):
+        if columns.any():
+            self._counts[:, columns] = 0
+            self._days[columns] = 0
+            self._dirty = True
+
+    def _topic_id(self, topic: str) -> int:
+        topic_id = self.topic_ids.get(topic)
+        if topic_id is None:
+            topic_id = len(self.topics)
+            self.topic_ids[topic] = topic_id
+            self.topics.append(topic)
+
+            if topic_id >= len(self._counts):
+                # Grow rows geometrically so new topics stay amortized O(1)
+                grown = np.zeros((max(16, 2 * len(self._counts)), self.window_days), dtype=np.int64)
+                grown[:len(self._counts)] = self._counts
+                self._counts = grown
+        return topic_id
+
+
+def open_trend_store(
+    backend: str = TREND_STORE_BACKEND,
+    json_path: str = TREND_STORE_PATH,
+    db_path: str = TREND_DB_PATH,
+    matrix_dir: str = TREND_MATRIX_DIR,
+    mmap: bool = False
+) -> TrendStore:
+    if backend == "matrix":
+        return MatrixTrendStore(matrix_dir, json_path, mmap=mmap)
+    if backend == "sqlite":
+        return SqliteTrendStore(db_path, json_path)
+    if backend == "json":
+        return JsonTrendStore(json_path)
+    raise ValueError(f"Unknown trend store backend: {backend}")
@@ -0,0 +1,54 @@
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from stores.atomic import atomic_write
+from config import TREND_VERSION_PATH
+
+
+class TrendVersion:
+    """
+    Marker bumped every time TopicCounterAgent commits a day (or an
+    interrupted day is discarded), so readers in other processes, like
+    the query service, know when the trend, rollup and topic stores
+    have changed without re-reading them.
+
+    On disk: {"version": n, "date": latest committed date,
+    "committed_at": unix time}. The file is replaced on every bump,
+    and reset_storage removes it.
+    """
+
+    def __init__(self, path: str = TREND_VERSION_PATH):
+        self.path = path
+        self._stamp = None
+        self._data: Dict = {"version": 0, "date": None, "committed_at": None}
+
+    def current(self) -> Dict:
+        """
+        The latest marker. It is re-read only when the file changed,
+        so polling it costs one stat().
+        """
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+
+        if stamp != self._stamp:
+            self._stamp = stamp
+            try:
+                with open(self.path, "r") as f:
+                    self._data = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                self._data = {"version": 0, "date": None, "committed_at": None}
+        return self._data
+
+    def bump(self, date: Optional[str]):
+        data = {
+            "version": self.current()["version"] + 1,
+            "date": date,
+            "committed_at": time.time()
+        }
+        with atomic_write(self.path) as f:
+            json.dump(data, f)
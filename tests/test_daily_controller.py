@@ -0,0 +1,50 @@
+import unittest
+from datetime import timedelta
+
+from orchestrator.daily_controller import DailyController
+from benchmarks.fake_play_store import FakePlayStore
+from benchmarks.workspace import workspace
+
+APP_ID = "test.app"
+DAYS = 30
+PAGE_SIZE = 100
+FAILING_PAGE = 20
+
+
+class DailyControllerResumeTest(unittest.TestCase):
+    """
+    A network error during the first day's whole-range fetch leaves
+    no completed day; --resume continues the cached session instead
+    of requesting every page again.
+    """
+
+    def setUp(self):
+        self.enterContext(workspace())
+
+        self.store = FakePlayStore(DAYS * PAGE_SIZE, days=DAYS)
+        first = self.store.newest.date() - timedelta(days=DAYS - 1)
+        self.dates = [(first + timedelta(days=offset)).isoformat() for offset in range(DAYS)]
+
+    def failing_reviews(self, *args, **kwargs):
+        if self.store.calls == FAILING_PAGE - 1:
+            raise ConnectionError("network down")
+        return self.store.reviews(*args, **kwargs)
+
+    def test_resume_after_failed_first_fetch(self):
+        controller = DailyController()
+        controller.manifest.begin(APP_ID, self.dates[0], self.dates[-1])
+        controller.ingestor.fetch_reviews = self.failing_reviews
+        with self.assertRaises(ConnectionError):
+            controller.run_days(app_link=APP_ID, dates=self.dates)
+        self.assertEqual(self.store.calls, FAILING_PAGE - 1)
+
+        resumed = DailyController(resume=True)
+        resumed.ingestor.fetch_reviews = self.store.reviews
+        resumed.run_days(app_link=APP_ID, dates=self.dates)
+
+        self.assertEqual(resumed.ingestor.pages_fetched, DAYS - (FAILING_PAGE - 1))
+        self.assertTrue(all(resumed.manifest.is_completed(date) for date in self.dates))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+
+from agents.review_ingestor import ReviewIngestorAgent
+from stores.raw_review_cache import RawReviewCache
+from benchmarks.fake_play_store import FakePlayStore
+
+DAYS = 30
+PAGE_SIZE = 100
+
+
+class ReviewIngestorPagingTest(unittest.TestCase):
+    """
+    The cursor is kept across days: a DAYS-day range costs one
+    google_play_scraper.reviews call per page, not one per day and
+    page before it.
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="raw-reviews-")
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+
+        self.store = FakePlayStore(DAYS * PAGE_SIZE, days=DAYS)
+        first = self.store.newest.date() - timedelta(days=DAYS - 1)
+        self.dates = [(first + timedelta(days=offset)).isoformat() for offset in range(DAYS)]
+
+    def ingestor(self, **kwargs) -> ReviewIngestorAgent:
+        return ReviewIngestorAgent(
+            cache=RawReviewCache(self.cache_dir),
+            fetch_reviews=self.store.reviews,
+            page_size=PAGE_SIZE,
+            **kwargs
+        )
+
+    def run_range(self, ingestor: ReviewIngestorAgent) -> int:
+        reviews = 0
+        for date in self.dates:
+            batch = ingestor.run(
+                app_id="test.app", date=date, start=self.dates[0], end=self.dates[-1]
+            )
+            self.assertTrue(all(review["at"].startswith(date) for review in batch))
+            reviews += len(batch)
+        return reviews
+
+    def test_one_fetch_per_page(self):
+        ingestor = self.ingestor()
+
+        self.assertEqual(self.run_range(ingestor), DAYS * PAGE_SIZE)
+        self.assertEqual(ingestor.pages_fetched, DAYS)
+        self.assertEqual(self.store.calls, DAYS)
+
+    def test_replay_fetches_nothing(self):
+        self.run_range(self.ingestor())
+        calls = self.store.calls
+
+        replayed = self.ingestor(replay=True)
+        self.assertEqual(self.run_range(replayed), DAYS * PAGE_SIZE)
+        self.assertEqual(replayed.pages_fetched, 0)
+        self.assertEqual(self.store.calls, calls)
+
+    def test_page_cap_holds_for_the_whole_range(self):
+        ingestor = self.ingestor(max_pages=5)
+
+        with self.assertLogs("agents.review_ingestor", level="WARNING") as logs:
+            reviews = self.run_range(ingestor)
+
+        self.assertEqual(ingestor.pages_fetched, 5)
+        self.assertEqual(self.store.calls, 5)
+        self.assertTrue(0 < reviews <= 5 * PAGE_SIZE)
+        incomplete = [line for line in logs.output if "are incomplete" in line]
+        self.assertTrue(any(self.dates[0] in line for line in incomplete))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from agents.topic_counter import TopicCounterAgent
+from agents.topic_deduplicator import TopicDeduplicatorAgent
+from agents.topic_discovery import TopicDiscoveryAgent
+from stores.evidence_store import EvidenceStore
+from stores.seen_review_store import SeenReviewStore
+from benchmarks.workspace import workspace
+
+REVIEWS = [
+    {"text": "delivery was very late again", "rating": 1},
+    {"text": "refund not received after cancelling", "rating": 1},
+    {"text": "delivery was very late again", "rating": 1},
+    {"text": "app crashes on login", "rating": 2},
+]
+
+
+class TopicCounterEvidenceTest(unittest.TestCase):
+    """
+    Evidence is offered only for reviews the counter counts, so a
+    topic's evidence count matches its trend count even when the
+    same reviews come through again (a re-run or a repeated page).
+    """
+
+    def setUp(self):
+        self.enterContext(workspace())
+
+        self.evidence = EvidenceStore()
+        self.discovery = TopicDiscoveryAgent()
+        self.deduplicator = TopicDeduplicatorAgent()
+        self.counter = TopicCounterAgent(
+            seen_reviews=SeenReviewStore(),
+            evidence=self.evidence,
+            deduplicator=self.deduplicator
+        )
+
+    def count(self, date: str) -> dict:
+        return self.counter.count_stream(
+            assignments=self.discovery.run_stream(reviews=REVIEWS),
+            date=date
+        )
+
+    def test_evidence_follows_counts(self):
+        counts = self.count("2024-10-01")
+        self.assertGreater(sum(counts.values()), 0)
+        for topic, count in counts.items():
+            self.assertEqual(self.evidence.count(topic), count)
+
+    def test_seen_reviews_offer_nothing(self):
+        first = self.count("2024-10-01")
+        again = self.count("2024-10-02")
+
+        self.assertEqual(sum(again.values()), 0)
+        for topic, count in first.items():
+            self.assertEqual(self.evidence.count(topic), count)
+
+    def test_list_api_carries_no_texts(self):
+        candidates = self.discovery.run(reviews=REVIEWS)
+        self.assertTrue(all(set(candidate) == {"topic", "review_hashes"} for candidate in candidates))
+
+        topics = self.deduplicator.run(candidate_topics=candidates)
+        day_counts = self.counter.run(candidate_topics=candidates, topics=topics, date="2024-10-01")
+        self.assertGreater(sum(day_counts.values()), 0)
+        self.assertFalse(self.evidence.reservoirs)
+
+    def test_commit_resolves_like_the_deduplicator(self):
+        topics = self.deduplicator.run(candidate_topics=[{"topic": "Refund pending"}])
+        candidate_counts = {"Refund pending": 2, "refund  PENDING ": 3}
+
+        day_counts = self.counter.commit(candidate_counts=candidate_counts, topics=topics, date="2024-10-01")
+        self.assertEqual(day_counts["Refund pending"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()